@@ -2,7 +2,17 @@
 
 __version__ = "0.2.4"
 
-from .cli import main
-from .sender import OTLPLogSender, SumoLogicSender
-
 __all__ = ["OTLPLogSender", "SumoLogicSender", "main"]
+
+
+def __getattr__(name):
+    """Lazily import the public API so importing the package stays cheap."""
+    if name == "main":
+        from .cli import main
+
+        return main
+    if name in ("OTLPLogSender", "SumoLogicSender"):
+        from . import sender
+
+        return getattr(sender, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,28 +1,32 @@
 """Command-line interface for flog-otlp."""
 
 import argparse
+import logging
 import sys
-from pathlib import Path
 from typing import Dict, List
 
-import yaml
-
 from .logging_config import setup_logging
 from .parser import parse_key_value_pairs
-from .scenario import ScenarioExecutor, ScenarioParser
-from .sender import OTLPLogSender, SumoLogicSender
 
 
 def load_strings_file(strings_file_path: str) -> Dict[str, List[str]]:
     """Load and validate strings file containing custom string arrays."""
-    strings_file = Path(strings_file_path)
+    # Imported here so runs without a strings file never load PyYAML
+    import yaml
+
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeLoader
 
-    if not strings_file.exists():
-        raise FileNotFoundError(f"Strings file not found: {strings_file_path}")
+    try:
+        f = open(strings_file_path, "rb")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Strings file not found: {strings_file_path}") from None
 
     try:
-        with open(strings_file, "r", encoding="utf-8") as f:
-            strings_data = yaml.safe_load(f)
+        with f:
+            strings_data = yaml.load(f, Loader=SafeLoader)
     except yaml.YAMLError as e:
         raise ValueError(f"Invalid YAML in strings file: {e}") from e
 
@@ -35,24 +39,46 @@ def load_strings_file(strings_file_path: str) -> Dict[str, List[str]]:
         if not isinstance(value, list):
             raise ValueError(f"Key '{key}' must be a list of strings, got {type(value).__name__}")
 
-        string_list = []
-        for i, item in enumerate(value):
-            if not isinstance(item, str):
-                raise ValueError(
-                    f"Key '{key}', item {i}: expected string, got {type(item).__name__}"
-                )
-            string_list.append(item)
+        # Only locate the offending item once the fast all() check has failed
+        if not all(isinstance(item, str) for item in value):
+            i, item = next((i, item) for i, item in enumerate(value) if not isinstance(item, str))
+            raise ValueError(f"Key '{key}', item {i}: expected string, got {type(item).__name__}")
 
-        if not string_list:
+        if not value:
             raise ValueError(f"Key '{key}' must contain at least one string")
 
-        validated_strings[key] = string_list
+        validated_strings[key] = value
 
     return validated_strings
 
 
-def parse_args():
+# Argument choices are module constants; tuples keep --help and error output in a stable order
+OUTPUT_TYPES = ("otlp", "sumologic")
+COMPRESSION_TYPES = ("none", "gzip", "zstd")
+LOG_FORMATS = (
+    "apache_common",
+    "apache_combined",
+    "apache_error",
+    "rfc3164",
+    "rfc5424",
+    "common_log",
+    "json",
+)
+
+# Built on first use and reused by later parse_args() calls in the same process
+_PARSER = None
+
+
+def parse_args(argv=None):
     """Parse command line arguments"""
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    return _PARSER.parse_args(argv)
+
+
+def _build_parser():
+    """Build the argument parser"""
     parser = argparse.ArgumentParser(
         description="OTLP Log Sender for flog - Generate logs and send to OTLP endpoint",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -80,6 +106,8 @@ Examples:
   %(prog)s --otlp-attributes environment=production --otlp-attributes region=us-east-1
   %(prog)s --telemetry-attributes app=web-server --telemetry-attributes debug=true
   %(prog)s --otlp-header "Authorization=Bearer token123" --otlp-header "X-Custom=value"
+  %(prog)s -n 10000 --delay 0 --batch-size 512    # Send logs in batches of 512 records
+  %(prog)s --batch-size 512 --otlp-compression gzip  # gzip-compress batched requests
 
 Supported log formats:
   apache_common, apache_combined, apache_error, rfc3164, rfc5424, common_log, json
@@ -89,7 +117,7 @@ Supported log formats:
     # Output type selection
     parser.add_argument(
         "--output-type",
-        choices=["otlp", "sumologic"],
+        choices=OUTPUT_TYPES,
         default="otlp",
         help="Output destination type: otlp or sumologic (default: otlp)",
     )
@@ -113,6 +141,13 @@ Supported log formats:
         help="Custom header for OTLP requests. Format: key=value. Can be repeated.",
     )
 
+    parser.add_argument(
+        "--otlp-compression",
+        choices=COMPRESSION_TYPES,
+        default="none",
+        help="Compression for OTLP request bodies; zstd requires the zstandard package (default: none)",
+    )
+
     parser.add_argument(
         "--telemetry-attributes",
         action="append",
@@ -126,7 +161,31 @@ Supported log formats:
     )
 
     parser.add_argument(
-        "--delay", type=float, default=0.1, help="Delay between log sends in seconds (default: 0.1)"
+        "--delay",
+        type=float,
+        default=0.1,
+        help="Minimum seconds between send requests (default: 0.1)",
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Number of log records to send per OTLP request (default: 1)",
+    )
+
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=30.0,
+        help="Maximum seconds a partial OTLP batch is held before sending (default: 30)",
+    )
+
+    parser.add_argument(
+        "--send-workers",
+        type=int,
+        default=1,
+        help="Number of OTLP requests sent concurrently while flog output is read (default: 1)",
     )
 
     # Sumo Logic specific options
@@ -175,15 +234,7 @@ Supported log formats:
     parser.add_argument(
         "-f",
         "--format",
-        choices=[
-            "apache_common",
-            "apache_combined",
-            "apache_error",
-            "rfc3164",
-            "rfc5424",
-            "common_log",
-            "json",
-        ],
+        choices=LOG_FORMATS,
         default="apache_common",
         help="Log format (default: apache_common)",
     )
@@ -221,12 +272,19 @@ Supported log formats:
         help="Path to YAML scenario file. When specified, executes the scenario instead of single/recurring mode.",
     )
 
+    parser.add_argument(
+        "--max-concurrent-steps",
+        type=int,
+        default=None,
+        help="Maximum number of scenario steps running at the same time (default: 32)",
+    )
+
     parser.add_argument(
         "--strings-file",
         help="Path to YAML file containing custom string arrays for %%S[key] replacement tokens.",
     )
 
-    return parser.parse_args()
+    return parser
 
 
 def build_flog_command(args):
@@ -263,6 +321,49 @@ def build_flog_command(args):
     return cmd
 
 
+def _otlp_configuration_lines(args, sender):
+    """Build the OTLP-specific configuration summary lines"""
+    lines = [f"  Endpoint: {args.otlp_endpoint}", f"  Service Name: {args.service_name}"]
+    if sender.otlp_attributes:
+        lines.append(f"  OTLP Attributes: {sender.otlp_attributes}")
+    if sender.telemetry_attributes:
+        lines.append(f"  Telemetry Attributes: {sender.telemetry_attributes}")
+    if args.otlp_compression != "none":
+        lines.append(f"  Compression: {args.otlp_compression}")
+    if args.batch_size > 1:
+        lines.append(f"  Batch Size: {args.batch_size}")
+        lines.append(f"  Flush Interval: {args.flush_interval}s")
+    if args.send_workers > 1:
+        lines.append(f"  Send Workers: {args.send_workers}")
+    return lines
+
+
+def _configuration_lines(args, sender):
+    """Build the indented configuration summary lines for non-scenario modes"""
+    lines = [f"  Output Type: {args.output_type}"]
+
+    if args.output_type == "sumologic":
+        lines.append(f"  Endpoint: {sender._obfuscate_endpoint(args.sumo_endpoint)}")
+        if args.sumo_category:
+            lines.append(f"  Category: {args.sumo_category}")
+        if args.sumo_name:
+            lines.append(f"  Name: {args.sumo_name}")
+        if args.sumo_host:
+            lines.append(f"  Host: {args.sumo_host}")
+        if sender.fields:
+            lines.append(f"  Fields: {sender.fields}")
+    else:  # otlp
+        lines.extend(_otlp_configuration_lines(args, sender))
+
+    lines.append(f"  Send Delay: {args.delay}s")
+    lines.append(f"  Log Format: {args.format}")
+    lines.append(f"  Log Count: {args.number}")
+    lines.append(f"  Duration: {args.sleep}")
+    lines.append(f"  Wait Time: {args.wait_time}s")
+    lines.append(f"  Max Executions: {'∞' if args.max_executions == 0 else args.max_executions}")
+    return lines
+
+
 def main():
     # Parse command line arguments
     args = parse_args()
@@ -279,7 +380,10 @@ def main():
             sys.exit(1)
 
     # Create sender instance based on output type
+    # Sender and scenario modules are imported per branch to keep CLI startup light
     if args.output_type == "sumologic":
+        from .sender import SumoLogicSender
+
         # Parse Sumo Logic fields
         sumo_fields = parse_key_value_pairs(args.sumo_fields)
 
@@ -292,24 +396,36 @@ def main():
             fields=sumo_fields,
         )
     else:  # otlp
+        from .sender import OTLPLogSender
+
         # Parse custom attributes and headers
         otlp_attributes = parse_key_value_pairs(args.otlp_attributes)
         telemetry_attributes = parse_key_value_pairs(args.telemetry_attributes)
         otlp_headers = parse_key_value_pairs(args.otlp_header)
 
-        sender = OTLPLogSender(
-            endpoint=args.otlp_endpoint,
-            service_name=args.service_name,
-            delay=args.delay,
-            otlp_headers=otlp_headers,
-            otlp_attributes=otlp_attributes,
-            telemetry_attributes=telemetry_attributes,
-            log_format=args.format,
-        )
+        try:
+            sender = OTLPLogSender(
+                endpoint=args.otlp_endpoint,
+                service_name=args.service_name,
+                delay=args.delay,
+                otlp_headers=otlp_headers,
+                otlp_attributes=otlp_attributes,
+                telemetry_attributes=telemetry_attributes,
+                log_format=args.format,
+                batch_size=args.batch_size,
+                flush_interval=args.flush_interval,
+                compression=args.otlp_compression,
+                send_workers=args.send_workers,
+            )
+        except ValueError as e:
+            logger.error(str(e))
+            sys.exit(1)
 
     # Determine execution mode
     if args.scenario:
         # Scenario execution mode
+        from .scenario import ScenarioExecutor, ScenarioParser
+
         logger.info("Using scenario execution mode")
         logger.info(f"Scenario file: {args.scenario}")
 
@@ -328,48 +444,26 @@ def main():
             scenario_parser = ScenarioParser(custom_strings)
             scenario = scenario_parser.load_scenario(args.scenario)
 
-            executor = ScenarioExecutor(sender, custom_strings)
+            executor = ScenarioExecutor(
+                sender, custom_strings, max_workers=args.max_concurrent_steps
+            )
             success = executor.execute_scenario(scenario, scenario_parser)
         except Exception as e:
             logger.error(f"Scenario execution failed: {e}")
             sys.exit(1)
     else:
-        # Log configuration details for non-scenario modes
-        logger.info("Configuration:")
-        logger.info(f"  Output Type: {args.output_type}")
-
-        if args.output_type == "sumologic":
-            logger.info(f"  Endpoint: {sender._obfuscate_endpoint(args.sumo_endpoint)}")
-            if args.sumo_category:
-                logger.info(f"  Category: {args.sumo_category}")
-            if args.sumo_name:
-                logger.info(f"  Name: {args.sumo_name}")
-            if args.sumo_host:
-                logger.info(f"  Host: {args.sumo_host}")
-            if sender.fields:
-                logger.info(f"  Fields: {sender.fields}")
-        else:  # otlp
-            logger.info(f"  Endpoint: {args.otlp_endpoint}")
-            logger.info(f"  Service Name: {args.service_name}")
-            if otlp_attributes:
-                logger.info(f"  OTLP Attributes: {otlp_attributes}")
-            if telemetry_attributes:
-                logger.info(f"  Telemetry Attributes: {telemetry_attributes}")
-            if otlp_headers:
-                logger.debug(
-                    f"  Custom Headers: {otlp_headers}"
-                )  # Headers may contain sensitive data
-
-        logger.info(f"  Send Delay: {args.delay}s")
-        logger.info(f"  Log Format: {args.format}")
-        logger.info(f"  Log Count: {args.number}")
-        logger.info(f"  Duration: {args.sleep}")
-        logger.info(f"  Wait Time: {args.wait_time}s")
-        logger.info(f"  Max Executions: {'∞' if args.max_executions == 0 else args.max_executions}")
+        # Log configuration details for non-scenario modes as a single record
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Configuration:\n%s", "\n".join(_configuration_lines(args, sender)))
+
+        if args.output_type == "otlp" and otlp_headers:
+            # Headers may contain sensitive data
+            logger.debug("  Custom Headers: %s", otlp_headers)
 
         # Build flog command
         flog_cmd = build_flog_command(args)
-        logger.debug(f"Built flog command: {' '.join(flog_cmd)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Built flog command: %s", " ".join(flog_cmd))
 
         if args.wait_time > 0 or args.max_executions != 1:
             # Recurring execution mode
@@ -380,6 +474,8 @@ def main():
             logger.info("Using single execution mode")
             success, _ = sender.process_flog_output(flog_cmd)
 
+    sender.close()
+
     if success:
         logger.info("All logs processed successfully")
     else:
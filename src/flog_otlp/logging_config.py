@@ -1,19 +1,87 @@
 """Logging configuration for flog-otlp."""
 
+import atexit
 import logging
+import logging.handlers
+import queue
+
+# Records buffered before the stream handler is forced to write them out
+MEMORY_HANDLER_CAPACITY = 256
+
+
+class CoalescingMemoryHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that writes buffered records to its stream in a single call.
+
+    Besides the usual capacity/flushLevel triggers it also flushes once the log
+    queue runs dry, so bursts are coalesced without holding back quiet periods.
+    """
+
+    def __init__(self, capacity, log_queue, flushLevel=logging.ERROR, target=None):
+        super().__init__(capacity, flushLevel=flushLevel, target=target)
+        self.log_queue = log_queue
+
+    def shouldFlush(self, record):
+        return super().shouldFlush(record) or self.log_queue.empty()
+
+    def flush(self):
+        with self.lock:
+            if not self.buffer or self.target is None:
+                return
+            try:
+                text = "".join(
+                    self.target.format(record) + self.target.terminator for record in self.buffer
+                )
+                # Hold the target's own lock so other writers through it can't interleave
+                self.target.acquire()
+                try:
+                    self.target.stream.write(text)
+                    self.target.flush()
+                finally:
+                    self.target.release()
+            except Exception:
+                self.handleError(self.buffer[-1])
+            finally:
+                self.buffer.clear()
 
 
 def setup_logging(verbose=False):
     """Configure logging for the application"""
     log_level = logging.DEBUG if verbose else logging.INFO
 
-    # Configure root logger
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
+    # Like basicConfig, repeated calls leave an already configured root logger alone
+    root_logger = logging.getLogger()
+    if any(isinstance(h, logging.handlers.QueueHandler) for h in root_logger.handlers):
+        return logging.getLogger("otlp_log_sender")
+
+    # The stream handler does the actual stderr writes on the listener thread
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter(
+            fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+    )
+
+    # Configure root logger to only enqueue records so the send loop never blocks on I/O
+    log_queue = queue.SimpleQueue()
+    root_logger.setLevel(log_level)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    # Batch records so each burst becomes one write to stderr
+    memory_handler = CoalescingMemoryHandler(
+        MEMORY_HANDLER_CAPACITY, log_queue, flushLevel=logging.ERROR, target=stream_handler
     )
 
+    listener = logging.handlers.QueueListener(log_queue, memory_handler, respect_handler_level=True)
+    listener.start()
+
+    # Drain any queued records and write out the buffer before the interpreter exits
+    def shutdown():
+        listener.stop()
+        memory_handler.flush()
+
+    atexit.register(shutdown)
+
     # Disable urllib3 warnings for self-signed certificates
     logging.getLogger("urllib3.connectionpool").setLevel(logging.WARNING)
 
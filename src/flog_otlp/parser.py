@@ -1,52 +1,71 @@
 """Parser utilities for flog-otlp."""
 
 import logging
+from functools import lru_cache
+
+_BOOL_VALUES = {"true": True, "false": False}
 
 
 def parse_key_value_pairs(values_list):
     """Parse key=value pairs from command line arguments"""
-    result = {}
-    logger = logging.getLogger("otlp_log_sender.parser")
-
     if not values_list:
-        return result
+        return {}
 
+    # Warned here rather than in the cached parse so every call reports malformed items
+    logger = logging.getLogger("otlp_log_sender.parser")
     for item in values_list:
         if "=" not in item:
             logger.warning(f"Ignoring malformed attribute '{item}' (expected format: key=value)")
+
+    # Results are cached per input, so hand back a copy callers are free to mutate
+    return dict(_parse_key_value_tuple(tuple(values_list)))
+
+
+@lru_cache(maxsize=256)
+def _parse_key_value_tuple(values):
+    """Parse a hashable tuple of key=value items, skipping malformed ones (cached)"""
+    result = {}
+
+    for item in values:
+        if "=" not in item:
             continue
 
         key, value = item.split("=", 1)
-        key = key.strip()
-        value = value.strip()
-
-        # Remove surrounding quotes from key if present
-        if (key.startswith('"') and key.endswith('"')) or (
-            key.startswith("'") and key.endswith("'")
-        ):
-            key = key[1:-1]
-
-        # Remove surrounding quotes from value if present
-        if (value.startswith('"') and value.endswith('"')) or (
-            value.startswith("'") and value.endswith("'")
-        ):
-            value = value[1:-1]
-
-        # Convert value to appropriate type
-        if value.lower() == "true":
-            result[key] = True
-        elif value.lower() == "false":
-            result[key] = False
-        else:
-            # Try to parse as integer
-            try:
-                result[key] = int(value)
-            except ValueError:
-                # Try to parse as float
-                try:
-                    result[key] = float(value)
-                except ValueError:
-                    # Keep as string
-                    result[key] = value
+        key = _unquote(key.strip())
+        value = _unquote(value.strip())
+
+        result[key] = _convert_value(value)
 
     return result
+
+
+def _unquote(text):
+    """Remove matching surrounding single or double quotes"""
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'":
+        return text[1:-1]
+    return text
+
+
+def _convert_value(value):
+    """Convert a string value to bool, int, float or leave it as a string"""
+    lowered = value.lower()
+    if lowered in _BOOL_VALUES:
+        return _BOOL_VALUES[lowered]
+
+    # Plain (optionally negative) integers skip the exception-driven fallbacks
+    digits = value[1:] if value.startswith("-") else value
+    if digits.isdecimal():
+        return int(value)
+
+    # Try to parse as integer
+    try:
+        return int(value)
+    except ValueError:
+        pass
+
+    # Try to parse as float
+    try:
+        return float(value)
+    except ValueError:
+        # Keep as string
+        return value
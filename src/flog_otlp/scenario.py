@@ -4,15 +4,115 @@ import logging
 import random
 import re
 import string
+import subprocess
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
 import yaml
 from lorem_text import lorem
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+from .parser import parse_key_value_pairs
+from .sender import stream_flog_lines
+
+# Single alternation matching every replacement formatting variable, compiled once at import
+_VAR_PAT = re.compile(
+    r"%(?:[seg]"
+    r"|n\[(?P<min>\d+),(?P<max>\d+)\]"
+    r"|[xX]\[(?P<hex_length>\d+)\]"
+    r"|r\[(?P<length>\d+)\]"
+    r"|S\[(?P<key>[^\]]+)\])"
+)
+# Numeric group references (\1, (?(1)...)) that prevent combining filters into one alternation
+_BACKREF_PAT = re.compile(r"\\[1-9]|\(\?\(\d")
+# Characters that give a filter pattern regex meaning; patterns without any are plain substrings
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+# Upper bound on scenario steps executing concurrently
+MAX_STEP_WORKERS = 32
+
+# Lorem ipsum sentences pre-generated per step for the %s replacement variable
+SENTENCE_POOL_SIZE = 256
+
+# Seconds per duration unit; a bare number is taken as seconds
+_DURATION_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600}
+
+_ALNUM = string.ascii_letters + string.digits
+
+
+@lru_cache(maxsize=1024)
+def _compile_cached(pattern: str) -> re.Pattern:
+    """Compile a filter or replacement pattern, shared by every step that uses it (cached)."""
+    return re.compile(pattern)
+
+
+@lru_cache(maxsize=256)
+def _compile_template(template: str) -> tuple:
+    """Split a replacement template into literal text and ``(kind, *args)`` variables (cached)."""
+    parts = []
+    position = 0
+    for match in _VAR_PAT.finditer(template):
+        if match.start() > position:
+            parts.append(template[position : match.start()])
+
+        kind = match.group(0)[1]
+        if kind == "n":
+            parts.append((kind, int(match.group("min")), int(match.group("max"))))
+        elif kind in "xX":
+            parts.append((kind, int(match.group("hex_length"))))
+        elif kind == "r":
+            parts.append((kind, int(match.group("length"))))
+        elif kind == "S":
+            parts.append((kind, match.group("key")))
+        else:
+            parts.append((kind,))
+        position = match.end()
+
+    if position < len(template):
+        parts.append(template[position:])
+    return tuple(parts)
+
+
+def _build_flog_command(parameters: Dict[str, Any]) -> List[str]:
+    """Build flog command from step parameters."""
+    cmd = ["flog"]
+
+    # Add format
+    if "format" in parameters:
+        cmd.extend(["-f", str(parameters["format"])])
+
+    # Add number of logs
+    if "number" in parameters:
+        cmd.extend(["-n", str(parameters["number"])])
+
+    # Add sleep duration
+    if "sleep" in parameters:
+        cmd.extend(["-s", str(parameters["sleep"])])
+
+    # Add no-loop flag
+    if parameters.get("no_loop"):
+        cmd.append("--no-loop")
+
+    # Add flog delay
+    if "delay_flog" in parameters:
+        cmd.extend(["-d", str(parameters["delay_flog"])])
+
+    # Add rate limiting
+    if "rate" in parameters:
+        cmd.extend(["-r", str(parameters["rate"])])
+
+    if "bytes" in parameters:
+        cmd.extend(["-p", str(parameters["bytes"])])
+
+    return cmd
+
 
 class ScenarioStep:
     """Represents a single step in a scenario."""
@@ -22,26 +122,33 @@ class ScenarioStep:
         self.interval_seconds = self._parse_duration(step_data.get("interval", "10s"))
         self.iterations = step_data.get("iterations", 1)
         self.parameters = step_data.get("parameters", {})
+        # Parameters are fixed once parsed, so the flog command is built once per step
+        self.flog_cmd = _build_flog_command(self.parameters)
         self.filters = step_data.get("filters", [])
         self.replacements = step_data.get("replacements", [])
         self.custom_strings = custom_strings or {}
 
+        # Each step draws from its own generator, optionally seeded for reproducible output
+        self._rng = random.Random(step_data.get("seed"))
+
         # Compile regex patterns for efficiency
         self.compiled_filters = []
         if self.filters:
-            import re
-
             for filter_pattern in self.filters:
                 try:
-                    self.compiled_filters.append(re.compile(filter_pattern))
+                    self.compiled_filters.append(_compile_cached(filter_pattern))
                 except re.error as e:
                     raise ValueError(f"Invalid regex filter pattern '{filter_pattern}': {e}") from e
 
+        # Plain-text filters are matched with substring checks instead of the regex engine
+        self._literal_filters = self._build_literal_filters(self.filters)
+
+        # Combine the filters into one pattern so each line is searched once
+        self._union_filter = self._build_union_filter(self.compiled_filters)
+
         # Compile replacement patterns
         self.compiled_replacements = []
         if self.replacements:
-            import re
-
             for replacement in self.replacements:
                 if (
                     not isinstance(replacement, dict)
@@ -52,115 +159,160 @@ class ScenarioStep:
                         f"Invalid replacement format: {replacement}. Expected dict with 'pattern' and 'replacement' keys."
                     )
                 try:
-                    compiled_pattern = re.compile(replacement["pattern"])
-                    self.compiled_replacements.append(
-                        (compiled_pattern, replacement["replacement"])
-                    )
+                    compiled_pattern = _compile_cached(replacement["pattern"])
+                    template = replacement["replacement"]
+                    # Templates without a % sigil are static and never need formatting
+                    has_variables = "%" in template
+                    if not has_variables:
+                        # Passed straight to sub(), so escape backslashes to keep the text literal
+                        template = template.replace("\\", "\\\\")
+                    self.compiled_replacements.append((compiled_pattern, template, has_variables))
                 except re.error as e:
                     raise ValueError(
                         f"Invalid regex replacement pattern '{replacement['pattern']}': {e}"
                     ) from e
 
+        # %s samples from sentences generated up front rather than building one per line
+        self._sentence_pool = []
+        if any("%s" in template for _, template, _ in self.compiled_replacements):
+            pool_size = step_data.get("sentence_pool_size", SENTENCE_POOL_SIZE)
+            self._sentence_pool = [self._sentence() for _ in range(max(1, int(pool_size)))]
+
+    def _sentence(self) -> str:
+        """Build a lorem ipsum sentence from the step's generator so ``seed`` covers ``%s``."""
+        sections = [
+            " ".join(self._rng.sample(lorem.WORDS, self._rng.randint(3, 12)))
+            for _ in range(self._rng.randint(2, 5))
+        ]
+        text = ", ".join(sections)
+        return f"{text[0].upper()}{text[1:]}{self._rng.choice('?.')}"
+
     def matches_filters(self, log_line: str) -> bool:
         """Check if a log line matches any of the regex filters."""
         if not self.compiled_filters:
             return True  # No filters means all logs pass through
 
+        if self._literal_filters is not None:
+            return any(literal in log_line for literal in self._literal_filters)
+
+        if self._union_filter is not None:
+            return self._union_filter.search(log_line) is not None
+
         for pattern in self.compiled_filters:
             if pattern.search(log_line):
                 return True
         return False
 
-    def apply_replacements(self, log_line: str) -> str:
-        """Apply regex replacements with formatting variables to a log line."""
+    @staticmethod
+    def _build_literal_filters(filters: List[str]) -> Optional[tuple]:
+        """Return the filters as plain substrings when none of them uses regex syntax."""
+        if not filters or any(_REGEX_METACHARS.intersection(f) for f in filters):
+            return None
+        return tuple(filters)
+
+    @staticmethod
+    def _build_union_filter(compiled_filters: List[re.Pattern]) -> Optional[re.Pattern]:
+        """Build a single alternation equivalent to searching each filter in turn.
+
+        Returns None when the filters can't be safely combined: numeric group
+        references would point at the wrong group once renumbered, and
+        inline global flags such as ``(?i)`` are only valid at the very start.
+        """
+        if len(compiled_filters) == 1:
+            return compiled_filters[0]
+        if not compiled_filters or any(_BACKREF_PAT.search(p.pattern) for p in compiled_filters):
+            return None
+
+        try:
+            return _compile_cached("|".join(f"(?:{p.pattern})" for p in compiled_filters))
+        except re.error:
+            return None
+
+    def apply_replacements(self, log_line: str, epoch: Optional[str] = None) -> str:
+        """Apply regex replacements with formatting variables to a log line.
+
+        ``epoch`` is an optional pre-rendered value for ``%e``; callers pass the
+        iteration's timestamp so it is not recomputed for every line.
+        """
         if not self.compiled_replacements:
             return log_line  # No replacements means return original line
 
         modified_line = log_line
-        for pattern, replacement_template in self.compiled_replacements:
-            # Apply formatting variables to replacement template
-            formatted_replacement = self._format_replacement_variables(replacement_template)
-            # Apply regex substitution using lambda to treat replacement as literal string
-            modified_line = pattern.sub(lambda m: formatted_replacement, modified_line)
+        for pattern, replacement_template, has_variables in self.compiled_replacements:
+            # Replacements run in order, each over the previous one's output
+            if has_variables:
+                replacement = self._lazy_replacement(replacement_template, epoch)
+                modified_line = pattern.sub(replacement, modified_line)
+            else:
+                # Pre-escaped literal string, substituted without a Python callback
+                modified_line = pattern.sub(replacement_template, modified_line)
 
         return modified_line
 
-    def _format_replacement_variables(self, template: str) -> str:
+    def _lazy_replacement(self, template: str, epoch: Optional[str] = None):
+        """Return a sub() callback that formats ``template`` on the first match only.
+
+        Lines the pattern doesn't match never pay for generating variables, and
+        every match on a line shares the same formatted value.
+        """
+        formatted = []
+
+        def replacement(match: re.Match) -> str:
+            if not formatted:
+                formatted.append(self._format_replacement_variables(template, epoch))
+            return formatted[0]
+
+        return replacement
+
+    def _format_replacement_variables(self, template: str, epoch: Optional[str] = None) -> str:
         """Format replacement variables in a template string."""
-        result = template
+        if "%" not in template:
+            return template  # No formatting variables present
+
+        # The template is parsed once; each call only generates the variable values
+        return "".join(
+            part if isinstance(part, str) else self._expand_variable(part, epoch)
+            for part in _compile_template(template)
+        )
+
+    def _expand_variable(self, variable: tuple, epoch: Optional[str] = None) -> str:
+        """Generate the value for a single pre-parsed ``(kind, *args)`` variable."""
+        kind = variable[0]
 
         # %s - Lorem ipsum sentence
-        if "%s" in result:
-            sentence = lorem.sentence()
-            result = result.replace("%s", sentence)
+        if kind == "s":
+            if not self._sentence_pool:
+                return self._sentence()
+            return self._rng.choice(self._sentence_pool)
+
+        # %e - Current epoch time (or the caller's per-iteration snapshot)
+        if kind == "e":
+            return epoch if epoch is not None else str(int(time.time()))
+
+        # %g - GUID format (8-4-4-4-12 hexadecimal) from a single 128-bit draw
+        if kind == "g":
+            digits = f"{self._rng.getrandbits(128):032x}"
+            return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
 
         # %n[x,y] - Random integer between x and y
-        import re
-
-        n_pattern = re.compile(r"%n\[(\d+),(\d+)\]")
-        for match in n_pattern.finditer(template):
-            min_val = int(match.group(1))
-            max_val = int(match.group(2))
-            random_int = str(random.randint(min_val, max_val))
-            result = result.replace(match.group(0), random_int)
-
-        # %e - Current epoch time
-        if "%e" in result:
-            epoch_time = str(int(time.time()))
-            result = result.replace("%e", epoch_time)
-
-        # %x[n] - Lowercase hexadecimal with length n
-        hex_pattern = re.compile(r"%x\[(\d+)\]")
-        for match in hex_pattern.finditer(template):
-            length = int(match.group(1))
-            max_value = (16**length) - 1
-            format_str = f"0{length}x"
-            hex_value = format(random.randint(0, max_value), format_str)
-            result = result.replace(match.group(0), hex_value, 1)
-
-        # %X[n] - Uppercase hexadecimal with length n
-        hex_upper_pattern = re.compile(r"%X\[(\d+)\]")
-        for match in hex_upper_pattern.finditer(template):
-            length = int(match.group(1))
-            max_value = (16**length) - 1
-            format_str = f"0{length}X"
-            hex_value = format(random.randint(0, max_value), format_str)
-            result = result.replace(match.group(0), hex_value, 1)
+        if kind == "n":
+            return str(self._rng.randint(variable[1], variable[2]))
+
+        # %x[n] / %X[n] - Lowercase / uppercase hexadecimal with length n
+        if kind in "xX":
+            length = variable[1]
+            return format(self._rng.getrandbits(4 * length), f"0{length}{kind}")
 
         # %r[n] - Random string of letters and digits of length n
-        r_pattern = re.compile(r"%r\[(\d+)\]")
-        for match in r_pattern.finditer(template):
-            length = int(match.group(1))
-            chars = string.ascii_letters + string.digits
-            random_string = "".join(random.choice(chars) for _ in range(length))
-            result = result.replace(match.group(0), random_string, 1)
-
-        # %g - GUID format (8-4-4-4-12 hexadecimal)
-        if "%g" in result:
-            # Generate 32 random hex digits
-            hex_chars = "0123456789abcdef"
-            guid_parts = [
-                "".join(random.choice(hex_chars) for _ in range(8)),  # 8 digits
-                "".join(random.choice(hex_chars) for _ in range(4)),  # 4 digits
-                "".join(random.choice(hex_chars) for _ in range(4)),  # 4 digits
-                "".join(random.choice(hex_chars) for _ in range(4)),  # 4 digits
-                "".join(random.choice(hex_chars) for _ in range(12)),  # 12 digits
-            ]
-            guid = "-".join(guid_parts)
-            result = result.replace("%g", guid)
+        if kind == "r":
+            return "".join(self._rng.choices(_ALNUM, k=variable[1]))
 
         # %S[key] - Custom string from strings file
-        s_pattern = re.compile(r"%S\[([^\]]+)\]")
-        for match in s_pattern.finditer(template):
-            key = match.group(1)
-            if key in self.custom_strings:
-                custom_string = random.choice(self.custom_strings[key])
-                result = result.replace(match.group(0), custom_string, 1)
-            else:
-                # If key not found, replace with a placeholder indicating missing key
-                result = result.replace(match.group(0), f"[MISSING_KEY:{key}]", 1)
-
-        return result
+        key = variable[1]
+        if key in self.custom_strings:
+            return self._rng.choice(self.custom_strings[key])
+        # If key not found, replace with a placeholder indicating missing key
+        return f"[MISSING_KEY:{key}]"
 
     @staticmethod
     def _parse_duration(duration_str: str) -> float:
@@ -170,25 +322,16 @@ class ScenarioStep:
 
         duration_str = str(duration_str).strip().lower()
 
-        # Match patterns like "5m", "30s", "1h", "90"
-        match = re.match(r"^(\d+(?:\.\d+)?)\s*([smh]?)$", duration_str)
-        if not match:
-            raise ValueError(f"Invalid duration format: {duration_str}")
-
-        value, unit = match.groups()
-        value = float(value)
+        # Split forms like "5m", "30s", "1h", "90" into number and optional unit
+        unit = duration_str[-1:] if duration_str[-1:] in _DURATION_UNITS else ""
+        number = duration_str[: -len(unit)].rstrip() if unit else duration_str
 
-        unit_multipliers = {
-            "": 1,  # default to seconds if no unit
-            "s": 1,  # seconds
-            "m": 60,  # minutes
-            "h": 3600,  # hours
-        }
-
-        if unit not in unit_multipliers:
-            raise ValueError(f"Unsupported time unit: {unit}")
+        # Only plain decimals are accepted, so float() never sees "inf", "1e3" or "-5"
+        whole, dot, fraction = number.partition(".")
+        if not whole.isdecimal() or (dot and not fraction.isdecimal()):
+            raise ValueError(f"Invalid duration format: {duration_str}")
 
-        return value * unit_multipliers[unit]
+        return float(number) * _DURATION_UNITS[unit]
 
 
 class ScenarioParser:
@@ -213,14 +356,15 @@ class ScenarioParser:
 
     def _load_yaml_file(self, scenario_path: str) -> Dict[str, Any]:
         """Load YAML file and return parsed data."""
-        scenario_file = Path(scenario_path)
-
-        if not scenario_file.exists():
-            raise FileNotFoundError(f"Scenario file not found: {scenario_path}")
+        # Open once in binary mode; the YAML reader detects and decodes UTF-8 itself
+        try:
+            f = open(scenario_path, "rb")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Scenario file not found: {scenario_path}") from None
 
         try:
-            with open(scenario_file, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f)
+            with f:
+                return yaml.load(f, Loader=_SafeLoader)
         except yaml.YAMLError as e:
             raise ValueError(f"Invalid YAML in scenario file: {e}") from e
 
@@ -260,36 +404,7 @@ class ScenarioParser:
 
     def build_flog_command_from_parameters(self, parameters: Dict[str, Any]) -> List[str]:
         """Build flog command from step parameters."""
-        cmd = ["flog"]
-
-        # Add format
-        if "format" in parameters:
-            cmd.extend(["-f", str(parameters["format"])])
-
-        # Add number of logs
-        if "number" in parameters:
-            cmd.extend(["-n", str(parameters["number"])])
-
-        # Add sleep duration
-        if "sleep" in parameters:
-            cmd.extend(["-s", str(parameters["sleep"])])
-
-        # Add no-loop flag
-        if parameters.get("no_loop"):
-            cmd.append("--no-loop")
-
-        # Add flog delay
-        if "delay_flog" in parameters:
-            cmd.extend(["-d", str(parameters["delay_flog"])])
-
-        # Add rate limiting
-        if "rate" in parameters:
-            cmd.extend(["-r", str(parameters["rate"])])
-
-        if "bytes" in parameters:
-            cmd.extend(["-p", str(parameters["bytes"])])
-
-        return cmd
+        return _build_flog_command(parameters)
 
     def get_total_scenario_duration(self, steps: List[ScenarioStep]) -> float:
         """Calculate total scenario duration in seconds."""
@@ -308,16 +423,41 @@ class ScenarioParser:
 
         return max_end_time
 
+    def get_max_concurrent_steps(self, steps: List[ScenarioStep]) -> int:
+        """Estimate the largest number of steps whose run windows overlap.
+
+        Each step is taken to run from its start time until its last iteration's
+        interval ends, matching the estimate used for the total scenario duration.
+        """
+        events = []
+        for step in steps:
+            end_time = step.start_time_seconds + step.iterations * step.interval_seconds
+            events.append((step.start_time_seconds, 1))
+            events.append((max(end_time, step.start_time_seconds), -1))
+
+        # Starts sort before ends at the same instant, so back-to-back steps count as overlapping
+        concurrent = peak = 0
+        for _, change in sorted(events, key=lambda event: (event[0], -event[1])):
+            concurrent += change
+            peak = max(peak, concurrent)
+        return peak
+
 
 class ScenarioExecutor:
     """Executes scenario steps with asynchronous timing control."""
 
-    def __init__(self, otlp_sender, custom_strings: Dict[str, List[str]] = None):
+    def __init__(
+        self,
+        otlp_sender,
+        custom_strings: Dict[str, List[str]] = None,
+        max_workers: Optional[int] = None,
+    ):
         self.otlp_sender = otlp_sender
         self.custom_strings = custom_strings or {}
+        self.max_workers = MAX_STEP_WORKERS if max_workers is None else max(1, max_workers)
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self.scenario_start_time = None
-        self.step_threads = []
+        self.step_futures = []
         self.stop_event = threading.Event()
 
     def execute_scenario(self, scenario: Dict[str, Any], scenario_parser: ScenarioParser) -> bool:
@@ -335,29 +475,42 @@ class ScenarioExecutor:
         self.logger.info(f"Estimated total scenario duration: {total_duration:.1f}s")
         self.logger.info(f"Number of steps: {len(steps)}")
 
-        # Schedule all steps asynchronously
+        # Steps run on a bounded pool; this thread only waits for each start offset
+        pool_size = max(1, min(len(steps), self.max_workers))
+        max_concurrent = scenario_parser.get_max_concurrent_steps(steps)
+        if max_concurrent > pool_size:
+            self.logger.warning(
+                f"Up to {max_concurrent} steps overlap but at most {pool_size} run concurrently; "
+                "overlapping steps beyond that start once an earlier step finishes "
+                "(raise --max-concurrent-steps to run them on time)"
+            )
+        pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="Step")
+
         success = True
         try:
-            for i, step in enumerate(steps, 1):
-                self._schedule_step(i, step, scenario_parser)
-
-            self.logger.info(f"All {len(steps)} steps scheduled. Waiting for completion...")
+            self._dispatch_steps(pool, steps)
 
             # Wait for all steps to complete or user interrupt
             try:
-                for thread in self.step_threads:
-                    thread.join()
+                wait(self.step_futures)
             except KeyboardInterrupt:
                 self.logger.warning("Scenario interrupted by user")
                 self.stop_event.set()
                 success = False
-                # Wait a bit for threads to stop gracefully
-                for thread in self.step_threads:
-                    thread.join(timeout=2)
+                # Wait a bit for running steps to stop gracefully
+                wait(self.step_futures, timeout=2)
 
+        except KeyboardInterrupt:
+            self.logger.warning("Scenario interrupted by user")
+            self.stop_event.set()
+            success = False
         except Exception as e:
             self.logger.error(f"Scenario execution error: {e}")
+            # Signal running steps to stop so their pool threads don't outlive the scenario
+            self.stop_event.set()
             success = False
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
 
         end_time = datetime.now(timezone.utc)
         total_elapsed = (end_time - self.scenario_start_time).total_seconds()
@@ -370,43 +523,68 @@ class ScenarioExecutor:
 
         return success
 
-    def _schedule_step(self, step_number: int, step: ScenarioStep, scenario_parser: ScenarioParser):
-        """Schedule a step for asynchronous execution."""
+    def _dispatch_steps(self, pool: ThreadPoolExecutor, steps: List[ScenarioStep]):
+        """Submit each step to the pool once its start offset arrives, until stopped."""
+        scenario_start = time.monotonic()
+
+        for i, step in enumerate(steps, 1):
+            if step.start_time_seconds > 0:
+                self.logger.info(f"Step {i} scheduled to start in {step.start_time_seconds:.1f}s")
+
+        # Dispatch in start-time order so a late step never holds back an earlier one;
+        # step numbers still follow the scenario's own ordering
+        for i, step in sorted(enumerate(steps, 1), key=lambda item: item[1].start_time_seconds):
+            time_to_wait = scenario_start + step.start_time_seconds - time.monotonic()
+            if time_to_wait > 0 and self.stop_event.wait(time_to_wait):
+                break
+            self._schedule_step(pool, i, step)
+
+        started = len(self.step_futures)
+        if started == len(steps):
+            self.logger.info(f"All {started} steps started. Waiting for completion...")
+        else:
+            self.logger.info(
+                f"Stopped after starting {started} of {len(steps)} steps. "
+                "Waiting for completion..."
+            )
 
-        def step_worker():
-            try:
-                # Wait for the step start time
-                time_to_wait = step.start_time_seconds
-                if time_to_wait > 0:
-                    self.logger.info(
-                        f"Step {step_number} scheduled to start in {time_to_wait:.1f}s"
-                    )
-                    time.sleep(time_to_wait)
+    def _schedule_step(self, pool: ThreadPoolExecutor, step_number: int, step: ScenarioStep):
+        """Submit a step whose start time has arrived to the worker pool."""
+        self.step_futures.append(pool.submit(self._run_step, step_number, step))
+
+    def _run_step(self, step_number: int, step: ScenarioStep):
+        """Run every iteration of a step on a pool worker."""
+        step_sender = None
+        try:
+            # Step parameters are fixed, so one sender (and its connection pool) serves every iteration
+            step_sender = self._create_step_sender(step.parameters)
 
+            # Iterations start on fixed monotonic deadlines so run time doesn't accumulate as drift
+            next_start = time.monotonic()
+            for iteration in range(step.iterations):
                 if self.stop_event.is_set():
-                    return
+                    break
 
-                # Execute iterations of this step
-                for iteration in range(step.iterations):
-                    if self.stop_event.is_set():
+                # Wait out the rest of the interval, waking early on stop
+                time_to_wait = next_start - time.monotonic()
+                if time_to_wait > 0:
+                    if self.stop_event.wait(time_to_wait):
                         break
+                else:
+                    # Start an overrunning step's next iteration now instead of bursting to catch up
+                    next_start = time.monotonic()
 
-                    if iteration > 0:
-                        # Wait for the interval before next iteration
-                        time.sleep(step.interval_seconds)
-
-                    self._execute_step_iteration(step_number, iteration + 1, step, scenario_parser)
-
-            except Exception as e:
-                self.logger.error(f"Step {step_number} worker error: {e}")
+                next_start += step.interval_seconds
+                self._execute_step_iteration(step_number, iteration + 1, step, step_sender)
 
-        thread = threading.Thread(target=step_worker, name=f"Step-{step_number}")
-        thread.daemon = True
-        self.step_threads.append(thread)
-        thread.start()
+        except Exception as e:
+            self.logger.error(f"Step {step_number} worker error: {e}")
+        finally:
+            if step_sender is not None:
+                step_sender.close()
 
     def _execute_step_iteration(
-        self, step_number: int, iteration: int, step: ScenarioStep, scenario_parser: ScenarioParser
+        self, step_number: int, iteration: int, step: ScenarioStep, step_sender
     ):
         """Execute a single iteration of a scenario step."""
         iteration_start = datetime.now(timezone.utc)
@@ -416,8 +594,8 @@ class ScenarioExecutor:
             f"Executing step {step_number}, iteration {iteration}/{step.iterations} at {iteration_start.strftime('%H:%M:%S UTC')} (T+{elapsed_since_start:.1f}s)"
         )
 
-        # Build flog command from step parameters
-        flog_cmd = scenario_parser.build_flog_command_from_parameters(step.parameters)
+        # flog command was built from the step parameters when the step was parsed
+        flog_cmd = step.flog_cmd
 
         # Log the flog command and parameters at info level
         self.logger.info(f"Step {step_number}.{iteration} flog command: {' '.join(flog_cmd)}")
@@ -426,12 +604,12 @@ class ScenarioExecutor:
         if step.filters:
             self.logger.info(f"Step {step_number}.{iteration} regex filters: {step.filters}")
 
-        # Create a temporary sender with step-specific parameters and filtering
-        step_sender = self._create_step_sender(step.parameters)
+        # %e resolves to the iteration start rather than being recomputed per line
+        epoch = str(int(iteration_start.timestamp()))
 
         # Execute the step iteration with filtering
         success, log_count, filtered_count = self._process_flog_output_with_filters(
-            step_sender, flog_cmd, step
+            step_sender, flog_cmd, step, epoch
         )
 
         iteration_end = datetime.now(timezone.utc)
@@ -451,10 +629,8 @@ class ScenarioExecutor:
                 f"Step {step_number}.{iteration} failed after {iteration_elapsed:.1f}s"
             )
 
-    def _process_flog_output_with_filters(self, sender, flog_cmd, step):
+    def _process_flog_output_with_filters(self, sender, flog_cmd, step, epoch=None):
         """Execute flog and process output with optional regex filtering."""
-        import subprocess
-
         self.logger.debug(f"Executing with filtering: {' '.join(flog_cmd)}")
         self.logger.debug(f"Sending logs to: {sender.endpoint}")
 
@@ -464,55 +640,24 @@ class ScenarioExecutor:
                 flog_cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
             )
 
-            line_count = 0
-            sent_count = 0
-            filtered_count = 0
+            # stderr is collected while stdout is read so neither pipe can fill up
+            stderr_buffer = bytearray()
 
-            # Process each line of output with filtering
-            for line in iter(process.stdout.readline, ""):
-                if line.strip():  # Skip empty lines
-                    line_count += 1
-
-                    # Apply regex filters if present
-                    if step.matches_filters(line.strip()):
-                        # Log original line before any replacements (verbose mode)
-                        self.logger.debug(f"Original log line before replacements: {line.strip()}")
-
-                        # Apply replacements if present
-                        processed_line = step.apply_replacements(line.strip())
-
-                        # Detailed log line processing at DEBUG level
-                        self.logger.debug(f"Processing line {sent_count + 1}: {processed_line}")
-
-                        # Parse the processed log line
-                        log_entry = sender.parse_flog_line(processed_line)
-
-                        # Create OTLP payload
-                        otlp_payload = sender.create_otlp_payload(log_entry)
-
-                        # Send to endpoint
-                        sender.send_log(otlp_payload)
-                        sent_count += 1
+            lines = stream_flog_lines(
+                process.stdout, stderr=process.stderr, stderr_buffer=stderr_buffer
+            )
+            line_count, sent_count, filtered_count = self._forward_lines(sender, lines, step, epoch)
 
-                        # Configurable delay to avoid overwhelming the endpoint
-                        if sender.delay > 0:
-                            time.sleep(sender.delay)
-                    else:
-                        filtered_count += 1
-                        self.logger.debug(
-                            f"Filtered out line {line_count}: {line.strip()[:100]}..."
-                        )
+            # Send any records still waiting in a partial batch
+            sender.flush()
 
             # Wait for process to complete
             process.wait()
 
             if process.returncode != 0:
-                stderr_output = process.stderr.read()
+                stderr_output = stderr_buffer.decode("utf-8", errors="replace")
                 self.logger.error(
                     f"flog process failed with return code {process.returncode}: {stderr_output}"
                 )
@@ -531,47 +676,88 @@ class ScenarioExecutor:
             self.logger.warning("Interrupted by user")
             if "process" in locals():
                 process.terminate()
+            sender.flush()
             return False, 0, 0
         except Exception as e:
             self.logger.error(f"Unexpected error: {e}")
             return False, 0, 0
 
+    def _forward_lines(self, sender, lines, step, epoch=None):
+        """Filter, rewrite and queue each line for batched sending; return the line counts."""
+        line_count = 0
+        sent_count = 0
+        filtered_count = 0
+
+        # Checked once so disabled per-line debug logging costs nothing
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+
+        # Steps without filters or replacements skip those calls entirely
+        has_filters = bool(step.compiled_filters)
+        has_replacements = bool(step.compiled_replacements)
+
+        # Bound once so the loop doesn't repeat attribute lookups for every line
+        matches_filters = step.matches_filters
+        apply_replacements = step.apply_replacements
+        parse_line = sender.parse_flog_line
+        queue_log = sender.queue_log
+
+        for line in lines:
+            line_count += 1
+
+            # Apply regex filters if present
+            if has_filters and not matches_filters(line):
+                filtered_count += 1
+                if debug_enabled:
+                    self.logger.debug("Filtered out line %d: %s...", line_count, line[:100])
+                continue
+
+            # Log original line before any replacements (verbose mode)
+            if debug_enabled:
+                self.logger.debug("Original log line before replacements: %s", line)
+
+            # Apply replacements if present
+            processed_line = apply_replacements(line, epoch) if has_replacements else line
+
+            # Detailed log line processing at DEBUG level
+            if debug_enabled:
+                self.logger.debug("Processing line %d: %s", sent_count + 1, processed_line)
+
+            # Parse the processed line and add it to the sender's pending batch; the
+            # sender applies the step's delay as a rate limit on requests
+            queue_log(parse_line(processed_line))
+            sent_count += 1
+
+        return line_count, sent_count, filtered_count
+
     def _create_step_sender(self, parameters: Dict[str, Any]):
         """Create an OTLP sender with step-specific parameters."""
-        from .parser import parse_key_value_pairs
-
         # Start with base sender configuration
-        step_sender = type(self.otlp_sender)(
-            endpoint=self.otlp_sender.endpoint,
-            service_name=self.otlp_sender.service_name,
-            delay=self.otlp_sender.delay,
-            otlp_headers=self.otlp_sender.otlp_headers.copy(),
-            otlp_attributes=self.otlp_sender.otlp_attributes.copy(),
-            telemetry_attributes=self.otlp_sender.telemetry_attributes.copy(),
-            log_format=parameters.get("format", self.otlp_sender.log_format),
-        )
+        otlp_headers = self.otlp_sender.otlp_headers.copy()
+        otlp_attributes = self.otlp_sender.otlp_attributes.copy()
+        telemetry_attributes = self.otlp_sender.telemetry_attributes.copy()
 
         # Override with step-specific attributes if provided
         if "otlp_attributes" in parameters:
-            step_otlp_attributes = parse_key_value_pairs(parameters["otlp_attributes"])
-            step_sender.otlp_attributes.update(step_otlp_attributes)
+            otlp_attributes.update(parse_key_value_pairs(parameters["otlp_attributes"]))
 
         if "telemetry_attributes" in parameters:
-            step_telemetry_attributes = parse_key_value_pairs(parameters["telemetry_attributes"])
-            step_sender.telemetry_attributes.update(step_telemetry_attributes)
+            telemetry_attributes.update(parse_key_value_pairs(parameters["telemetry_attributes"]))
 
         if "otlp_header" in parameters:
-            step_headers = parse_key_value_pairs(parameters["otlp_header"])
-            step_sender.otlp_headers.update(step_headers)
-
-        # Override other step-specific parameters
-        if "delay" in parameters:
-            step_sender.delay = float(parameters["delay"])
-
-        if "service_name" in parameters:
-            step_sender.service_name = str(parameters["service_name"])
-
-        if "otlp_endpoint" in parameters:
-            step_sender.endpoint = str(parameters["otlp_endpoint"])
-
-        return step_sender
+            otlp_headers.update(parse_key_value_pairs(parameters["otlp_header"]))
+
+        # Overrides are applied before construction because the sender builds its
+        # static OTLP resource and attributes once in __init__
+        return type(self.otlp_sender)(
+            endpoint=str(parameters.get("otlp_endpoint", self.otlp_sender.endpoint)),
+            service_name=str(parameters.get("service_name", self.otlp_sender.service_name)),
+            delay=float(parameters.get("delay", self.otlp_sender.delay)),
+            otlp_headers=otlp_headers,
+            otlp_attributes=otlp_attributes,
+            telemetry_attributes=telemetry_attributes,
+            log_format=parameters.get("format", self.otlp_sender.log_format),
+            batch_size=self.otlp_sender.batch_size,
+            flush_interval=self.otlp_sender.flush_interval,
+            compression=self.otlp_sender.compression,
+            send_workers=self.otlp_sender.send_workers,
+        )
@@ -1,12 +1,284 @@
 """OTLP and Sumo Logic log sender implementations."""
 
+import calendar
+import gzip
 import json
 import logging
+import os
+import queue
+import selectors
 import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+# Read size for draining flog's stdout pipe; 128 KB keeps syscalls per line low
+READ_CHUNK_SIZE = 131072
+
+# Number of read chunks the background reader may buffer ahead of the sender
+READ_QUEUE_MAXSIZE = 64
+
+# Upper bound on the summed message size of one OTLP batch before it is flushed
+MAX_BATCH_BYTES = 1_048_576
+
+# Records at or above this severity number (ERROR) flush the pending batch immediately
+FLUSH_SEVERITY_NUMBER = 17
+
+# OTLP severity numbers by log level; lowercase spellings are included so the
+# common cases resolve without an upper() call
+SEVERITY_NUMBERS = {
+    "TRACE": 1,
+    "DEBUG": 5,
+    "INFO": 9,
+    "WARN": 13,
+    "WARNING": 13,
+    "ERROR": 17,
+    "FATAL": 21,
+    "CRITICAL": 21,
+}
+SEVERITY_NUMBERS.update({level.lower(): number for level, number in SEVERITY_NUMBERS.items()})
+
+# Supported OTLP request body encodings; bodies below the threshold are sent as-is
+COMPRESSION_TYPES = ("none", "gzip", "zstd")
+COMPRESSION_MIN_BYTES = 1024
+
+
+def iter_flog_line_chunks(
+    stream, chunk_size=READ_CHUNK_SIZE, stderr=None, stderr_buffer=None, decode=True
+):
+    """Yield lists of non-empty, stripped lines, one list per bulk read from a binary pipe.
+
+    When ``stderr`` is given it is drained alongside ``stream`` and its bytes are
+    appended to ``stderr_buffer``, so a chatty stderr can never stall flog. With
+    ``decode=False`` lines are yielded as raw ``bytes`` for senders that post them as-is.
+    """
+    split_lines = _decode_lines if decode else _strip_lines
+    stdout_fd = stream.fileno()
+    selector = _pipe_selector(stream, stderr)
+
+    buffer = bytearray()
+    try:
+        while selector.get_map():
+            for key, _ in selector.select():
+                try:
+                    chunk = os.read(key.fd, chunk_size)
+                except BlockingIOError:
+                    continue
+                if not chunk:
+                    selector.unregister(key.fd)
+                    continue
+
+                if key.fd != stdout_fd:
+                    if stderr_buffer is not None:
+                        stderr_buffer += chunk
+                    continue
+
+                buffer += chunk
+                raw_lines = buffer.split(b"\n")
+                # Keep the trailing partial line for the next read
+                buffer = raw_lines.pop()
+                lines = split_lines(raw_lines)
+                if lines:
+                    yield lines
+    finally:
+        selector.close()
+
+    lines = split_lines([buffer])
+    if lines:
+        yield lines
+
+
+def _pipe_selector(*pipes):
+    """Return a selector watching the given pipes, switched to non-blocking reads."""
+    selector = selectors.DefaultSelector()
+    for pipe in pipes:
+        if pipe is not None:
+            os.set_blocking(pipe.fileno(), False)
+            selector.register(pipe.fileno(), selectors.EVENT_READ)
+    return selector
+
+
+def _decode_lines(raw_lines):
+    """Decode raw byte lines, dropping any that are empty once stripped."""
+    return [
+        line
+        for line in (raw.decode("utf-8", errors="replace").strip() for raw in raw_lines)
+        if line
+    ]
+
+
+def _strip_lines(raw_lines):
+    """Strip raw byte lines without decoding, dropping any that end up empty."""
+    return [bytes(line) for line in (raw.strip() for raw in raw_lines) if line]
+
+
+def iter_flog_lines(stream, chunk_size=READ_CHUNK_SIZE):
+    """Yield non-empty, stripped lines from a binary pipe using bulk reads."""
+    for lines in iter_flog_line_chunks(stream, chunk_size):
+        yield from lines
+
+
+def stream_flog_lines(
+    stream,
+    chunk_size=READ_CHUNK_SIZE,
+    maxsize=READ_QUEUE_MAXSIZE,
+    stderr=None,
+    stderr_buffer=None,
+    decode=True,
+):
+    """Yield lines from a binary pipe drained by a background reader thread.
+
+    Reading on a separate thread keeps flog's pipe flowing while the caller is
+    blocked on HTTP sends; the bounded queue caps how far the reader runs ahead.
+    """
+    line_queue = queue.Queue(maxsize=maxsize)
+    stop_event = threading.Event()
+
+    def put(item):
+        while not stop_event.is_set():
+            try:
+                line_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def reader():
+        try:
+            for lines in iter_flog_line_chunks(stream, chunk_size, stderr, stderr_buffer, decode):
+                put(lines)
+        except Exception as e:
+            # Hand the failure over to the consuming thread
+            put(e)
+        finally:
+            put(None)
+
+    thread = threading.Thread(target=reader, name="flog-reader", daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = line_queue.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield from item
+    finally:
+        stop_event.set()
+
+
+def json_dumps(obj):
+    """Serialize an object to compact UTF-8 JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson rejects integers beyond 64 bits; stdlib json encodes them
+            pass
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(text):
+    """Parse JSON text, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+@lru_cache(maxsize=1024)
+def parse_utc_timestamp_ns(timestamp):
+    """Parse a ``YYYY-MM-DDTHH:MM:SS[.fraction]Z`` timestamp to nanoseconds by slicing.
+
+    Returns None for anything outside that exact shape so callers can fall back
+    to ``datetime.fromisoformat``. Results are cached, since consecutive flog lines
+    usually share the same second-resolution timestamp.
+    """
+    if len(timestamp) < 20 or timestamp[-1] != "Z" or timestamp[19] not in ".Z":
+        return None
+    if timestamp[19] == "Z" and len(timestamp) != 20:
+        return None
+    if timestamp[4] != "-" or timestamp[7] != "-" or timestamp[10] != "T":
+        return None
+    if timestamp[13] != ":" or timestamp[16] != ":":
+        return None
+
+    fields = (
+        timestamp[0:4],
+        timestamp[5:7],
+        timestamp[8:10],
+        timestamp[11:13],
+        timestamp[14:16],
+        timestamp[17:19],
+    )
+    fraction = timestamp[20:-1]
+    digits = "".join(fields) + fraction
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    if timestamp[19] == "." and not fraction:
+        return None
+
+    year, month, day, hour, minute, second = map(int, fields)
+    if not 1 <= month <= 12 or hour > 23 or minute > 59 or second > 59:
+        return None
+    if not 1 <= day <= calendar.monthrange(year, month)[1]:
+        return None
+
+    seconds = calendar.timegm((year, month, day, hour, minute, second))
+    nanos = int(fraction[:9].ljust(9, "0")) if fraction else 0
+    return seconds * 1_000_000_000 + nanos
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` acquisitions per second with bursts up to ``burst``.
+
+    Callers that overdraw the bucket sleep off their share of the deficit, so the
+    time spent sending counts towards the interval instead of adding to it.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Take tokens from the bucket, sleeping until they would have been available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+def create_session(pool_maxsize=4):
+    """Create a keep-alive HTTP session with a small connection pool and retries."""
+    session = requests.Session()
+    retries = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 
 class OTLPLogSender:
@@ -19,6 +291,10 @@ class OTLPLogSender:
         otlp_attributes=None,
         telemetry_attributes=None,
         log_format="apache_common",
+        batch_size=1,
+        flush_interval=30.0,
+        compression="none",
+        send_workers=1,
     ):
         self.endpoint = endpoint
         self.service_name = service_name
@@ -27,9 +303,56 @@ class OTLPLogSender:
         self.otlp_headers = otlp_headers or {}
         self.otlp_attributes = otlp_attributes or {}
         self.telemetry_attributes = telemetry_attributes or {}
-        self.session = requests.Session()
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.compression = compression
+        self.send_workers = max(1, send_workers)
+        self.session = create_session(pool_maxsize=max(4, self.send_workers))
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
+        if compression not in COMPRESSION_TYPES:
+            raise ValueError(
+                f"Unsupported compression '{compression}' (expected one of: {', '.join(COMPRESSION_TYPES)})"
+            )
+
+        self._zstd_compressor = None
+        if compression == "zstd":
+            try:
+                import zstandard
+            except ImportError as e:
+                raise ValueError(
+                    "zstd compression requires the 'zstandard' package: pip install 'flog-otlp[zstd]'"
+                ) from e
+            self._zstd_compressor = zstandard.ZstdCompressor(level=3)
+
+        # Resource, scope and log attributes are fixed for the sender's lifetime,
+        # so build them once rather than for every exported batch
+        self._resource = {"attributes": self._build_resource_attributes()}
+        self._scope = {"name": "flog-processor", "version": "1.0.0"}
+        self._log_attributes = self._build_log_attributes()
+
+        # Request headers never change after construction, so merge them once
+        self._headers = {"Content-Type": "application/json", "User-Agent": "otlp-log-sender/1.0"}
+        self._headers.update(self.otlp_headers)
+
+        # Log entries waiting to be exported as a single OTLP request
+        self._pending_entries = []
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+
+        # --delay spaces requests as a rate limit rather than a fixed sleep after each one
+        self._rate_limiter = RateLimiter(1 / delay) if delay > 0 else None
+
+        # With several send workers, batches are posted on a pool while the caller keeps
+        # reading flog; the semaphore caps queued plus in-flight requests for backpressure
+        self._send_pool = None
+        self._send_slots = None
+        if self.send_workers > 1:
+            self._send_pool = ThreadPoolExecutor(
+                max_workers=self.send_workers, thread_name_prefix="otlp-send"
+            )
+            self._send_slots = threading.BoundedSemaphore(2 * self.send_workers)
+
         # Note: OTLP HTTP/JSON typically uses HTTP on port 4318
         # Use HTTPS (port 4318) only if your collector is specifically configured for it
         # For HTTPS, change endpoint to https://localhost:4318/v1/logs and uncomment below:
@@ -39,49 +362,65 @@ class OTLPLogSender:
         # urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
     def parse_flog_line(self, line):
-        """Parse a single flog line and extract relevant information"""
-        try:
-            # Try to parse as JSON first (if flog outputs JSON)
-            log_data = json.loads(line)
-            return {
-                "message": log_data.get("message", line),
-                "level": log_data.get("level", "INFO"),
-                "timestamp": log_data.get(
-                    "time", datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-                ),
-            }
-        except json.JSONDecodeError:
-            # If not JSON, treat as plain text log
-            return {
-                "message": line.strip(),
-                "level": "INFO",
-                "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
-            }
+        """Parse a single flog line and extract relevant information.
+
+        The timestamp is always integer nanoseconds since the Unix epoch: the line's
+        own ISO time when it has one, otherwise the receive time.
+        """
+        # Only JSON objects are decoded; plain-text formats never pay for a failed parse
+        if line.lstrip().startswith("{"):
+            try:
+                log_data = json_loads(line)
+                timestamp = log_data.get("time")
+                level = log_data.get("level", "INFO")
+                message = log_data.get("message", line)
+                return {
+                    "message": message if isinstance(message, str) else str(message),
+                    "level": level,
+                    "severity_number": self.get_severity_number(level),
+                    "timestamp": (
+                        self._timestamp_to_ns(timestamp)
+                        if isinstance(timestamp, str)
+                        else time.time_ns()
+                    ),
+                }
+            except json.JSONDecodeError:
+                pass
+
+        # If not JSON, treat as plain text log
+        return {
+            "message": line.strip(),
+            "level": "INFO",
+            "severity_number": SEVERITY_NUMBERS["INFO"],
+            "timestamp": time.time_ns(),
+        }
 
     def create_otlp_payload(self, log_entry):
         """Create OTLP-compliant JSON payload"""
-        # Convert timestamp to nanoseconds since Unix epoch (always in UTC)
-        try:
-            if log_entry["timestamp"].endswith("Z"):
-                # ISO format with Z suffix (UTC)
-                dt = datetime.fromisoformat(log_entry["timestamp"][:-1]).replace(
-                    tzinfo=timezone.utc
-                )
-            else:
-                # Try to parse as ISO format and assume UTC if no timezone info
-                try:
-                    dt = datetime.fromisoformat(log_entry["timestamp"])
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=timezone.utc)
-                except ValueError:
-                    # Fallback to current UTC time
-                    dt = datetime.now(timezone.utc)
-            timestamp_ns = int(dt.timestamp() * 1_000_000_000)
-        except Exception:
-            # Fallback to current UTC time
-            timestamp_ns = int(datetime.now(timezone.utc).timestamp() * 1_000_000_000)
+        return self.create_otlp_batch_payload([log_entry])
+
+    def create_otlp_batch_payload(self, log_entries):
+        """Create OTLP-compliant JSON payload carrying multiple log records"""
+        payload = {
+            "resourceLogs": [
+                {
+                    "resource": self._resource,
+                    "scopeLogs": [
+                        {
+                            "scope": self._scope,
+                            "logRecords": [
+                                self._create_log_record(log_entry, self._log_attributes)
+                                for log_entry in log_entries
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+        return payload
 
-        # Build resource attributes - start with defaults then add custom OTLP attributes
+    def _build_resource_attributes(self):
+        """Build resource attributes - start with defaults then add custom OTLP attributes"""
         resource_attributes = [
             {"key": "service.name", "value": {"stringValue": self.service_name}},
             {"key": "service.version", "value": {"stringValue": "1.0.0"}},
@@ -91,7 +430,10 @@ class OTLPLogSender:
         for key, value in self.otlp_attributes.items():
             resource_attributes.append({"key": key, "value": self._convert_attribute_value(value)})
 
-        # Build log record attributes - start with defaults then add telemetry attributes
+        return resource_attributes
+
+    def _build_log_attributes(self):
+        """Build log record attributes - start with defaults then add telemetry attributes"""
         log_attributes = [
             {"key": "log_source", "value": {"stringValue": "flog"}},
             {"key": "log_type", "value": {"stringValue": self.log_format}},
@@ -101,30 +443,55 @@ class OTLPLogSender:
         for key, value in self.telemetry_attributes.items():
             log_attributes.append({"key": key, "value": self._convert_attribute_value(value)})
 
-        payload = {
-            "resourceLogs": [
-                {
-                    "resource": {"attributes": resource_attributes},
-                    "scopeLogs": [
-                        {
-                            "scope": {"name": "flog-processor", "version": "1.0.0"},
-                            "logRecords": [
-                                {
-                                    "timeUnixNano": str(timestamp_ns),
-                                    "severityText": log_entry["level"],
-                                    "severityNumber": self.get_severity_number(log_entry["level"]),
-                                    "body": {"stringValue": log_entry["message"]},
-                                    "attributes": log_attributes,
-                                    "traceId": "",
-                                    "spanId": "",
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
+        return log_attributes
+
+    def _create_log_record(self, log_entry, log_attributes):
+        """Create a single OTLP log record from a parsed log entry"""
+        timestamp = log_entry["timestamp"]
+        if not isinstance(timestamp, int):
+            # Entries built outside parse_flog_line may still carry ISO strings
+            timestamp = self._timestamp_to_ns(timestamp)
+
+        return {
+            "timeUnixNano": str(timestamp),
+            "severityText": log_entry["level"],
+            "severityNumber": (
+                log_entry["severity_number"]
+                if "severity_number" in log_entry
+                else self.get_severity_number(log_entry["level"])
+            ),
+            "body": {"stringValue": log_entry["message"]},
+            "attributes": log_attributes,
+            "traceId": "",
+            "spanId": "",
         }
-        return payload
+
+    @staticmethod
+    def _timestamp_to_ns(timestamp):
+        """Convert a parsed entry's timestamp to nanoseconds since Unix epoch (always in UTC)"""
+        if isinstance(timestamp, int):
+            # Already nanoseconds, no string round-trip needed
+            return timestamp
+
+        # flog's RFC 3339 "...Z" timestamps are sliced directly
+        if isinstance(timestamp, str):
+            timestamp_ns = parse_utc_timestamp_ns(timestamp)
+            if timestamp_ns is not None:
+                return timestamp_ns
+
+        try:
+            if timestamp.endswith("Z"):
+                # ISO format with Z suffix (UTC)
+                dt = datetime.fromisoformat(timestamp[:-1]).replace(tzinfo=timezone.utc)
+            else:
+                # Parse as ISO format and assume UTC if no timezone info
+                dt = datetime.fromisoformat(timestamp)
+                if dt.tzinfo is None:
+                    dt = dt.replace(tzinfo=timezone.utc)
+            return int(dt.timestamp() * 1_000_000_000)
+        except Exception:
+            # Fallback to current UTC time
+            return time.time_ns()
 
     def _convert_attribute_value(self, value):
         """Convert attribute value to OTLP format"""
@@ -142,27 +509,20 @@ class OTLPLogSender:
 
     def get_severity_number(self, level):
         """Convert log level to OTLP severity number"""
-        level_map = {
-            "TRACE": 1,
-            "DEBUG": 5,
-            "INFO": 9,
-            "WARN": 13,
-            "WARNING": 13,
-            "ERROR": 17,
-            "FATAL": 21,
-            "CRITICAL": 21,
-        }
-        return level_map.get(level.upper(), 9)  # Default to INFO
+        severity_number = SEVERITY_NUMBERS.get(level)
+        if severity_number is None:
+            severity_number = SEVERITY_NUMBERS.get(level.upper(), 9)  # Default to INFO
+        return severity_number
 
     def send_log(self, payload):
         """Send OTLP payload to the endpoint"""
-        headers = {"Content-Type": "application/json", "User-Agent": "otlp-log-sender/1.0"}
-
-        # Add custom OTLP headers
-        headers.update(self.otlp_headers)
+        body, content_encoding = self._encode_body(payload)
+        headers = self._headers
+        if content_encoding:
+            headers = {**headers, "Content-Encoding": content_encoding}
 
         try:
-            response = self.session.post(self.endpoint, json=payload, headers=headers, timeout=10)
+            response = self.session.post(self.endpoint, data=body, headers=headers, timeout=10)
 
             if response.status_code == 200:
                 self.logger.debug("Log sent successfully")
@@ -172,6 +532,69 @@ class OTLPLogSender:
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Request failed: {e}")
 
+    def _encode_body(self, payload):
+        """Serialize payload to JSON, returning the body and its Content-Encoding (or None)"""
+        body = json_dumps(payload)
+        if self.compression == "none" or len(body) < COMPRESSION_MIN_BYTES:
+            return body, None
+
+        if self.compression == "gzip":
+            return gzip.compress(body, compresslevel=1), "gzip"
+        return self._zstd_compressor.compress(body), "zstd"
+
+    def close(self):
+        """Flush pending records, wait for in-flight sends and release pooled HTTP connections"""
+        self.flush()
+        if self._send_pool is not None:
+            self._send_pool.shutdown(wait=True)
+        self.session.close()
+
+    def queue_log(self, log_entry):
+        """Add a parsed log entry to the pending batch, flushing when it is due.
+
+        Returns True when the entry triggered a send.
+        """
+        # Entries from parse_flog_line carry their severity; others get it resolved once here
+        if "severity_number" not in log_entry:
+            log_entry["severity_number"] = self.get_severity_number(log_entry["level"])
+
+        self._pending_entries.append(log_entry)
+        self._pending_bytes += len(log_entry["message"])
+
+        if (
+            len(self._pending_entries) >= self.batch_size
+            or self._pending_bytes >= MAX_BATCH_BYTES
+            or log_entry["severity_number"] >= FLUSH_SEVERITY_NUMBER
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+            return True
+        return False
+
+    def flush(self):
+        """Send all pending log entries as a single OTLP request"""
+        if self._pending_entries:
+            self.logger.debug("Flushing batch of %d log records", len(self._pending_entries))
+            payload = self.create_otlp_batch_payload(self._pending_entries)
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+            if self._send_pool is None:
+                self.send_log(payload)
+            else:
+                # Blocks once too many requests are outstanding
+                self._send_slots.acquire()
+                future = self._send_pool.submit(self.send_log, payload)
+                future.add_done_callback(self._send_done)
+            self._pending_entries = []
+            self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+
+    def _send_done(self, future):
+        """Release a send slot and report any unexpected error from a pooled send"""
+        self._send_slots.release()
+        if future.exception() is not None:
+            self.logger.error(f"Send failed: {future.exception()}")
+
     def process_flog_output(self, flog_cmd):
         """Execute flog and process its output"""
         self.logger.info(f"Executing: {' '.join(flog_cmd)}")
@@ -183,38 +606,37 @@ class OTLPLogSender:
                 flog_cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
             )
 
             line_count = 0
 
-            # Process each line of output
-            for line in iter(process.stdout.readline, ""):
-                if line.strip():  # Skip empty lines
-                    line_count += 1
-                    # Detailed log line processing at DEBUG level
-                    self.logger.debug(f"Processing line {line_count}: {line.strip()[:100]}...")
+            # Checked once so disabled per-line debug logging costs nothing
+            debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
 
-                    # Parse the log line
-                    log_entry = self.parse_flog_line(line)
+            # stderr is collected while stdout is read so neither pipe can fill up
+            stderr_buffer = bytearray()
 
-                    # Create OTLP payload
-                    otlp_payload = self.create_otlp_payload(log_entry)
+            # Process each line of output
+            for line in stream_flog_lines(
+                process.stdout, stderr=process.stderr, stderr_buffer=stderr_buffer
+            ):
+                line_count += 1
+                # Detailed log line processing at DEBUG level
+                if debug_enabled:
+                    self.logger.debug("Processing line %d: %s...", line_count, line[:100])
 
-                    # Send to endpoint
-                    self.send_log(otlp_payload)
+                # Parse the log line and add it to the pending batch; sends are rate limited
+                log_entry = self.parse_flog_line(line)
+                self.queue_log(log_entry)
 
-                    # Configurable delay to avoid overwhelming the endpoint
-                    if self.delay > 0:
-                        time.sleep(self.delay)
+            # Send any records still waiting in a partial batch
+            self.flush()
 
             # Wait for process to complete
             process.wait()
 
             if process.returncode != 0:
-                stderr_output = process.stderr.read()
+                stderr_output = stderr_buffer.decode("utf-8", errors="replace")
                 self.logger.error(
                     f"flog process failed with return code {process.returncode}: {stderr_output}"
                 )
@@ -231,6 +653,7 @@ class OTLPLogSender:
             self.logger.warning("Interrupted by user")
             if "process" in locals():
                 process.terminate()
+            self.flush()
             return False, 0
         except Exception as e:
             self.logger.error(f"Unexpected error: {e}")
@@ -321,9 +744,30 @@ class SumoLogicSender:
         self.name = name
         self.host = host
         self.fields = fields or {}
-        self.session = requests.Session()
+        self.session = create_session()
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
+        # Metadata headers are fixed for the sender's lifetime, so build them once
+        self._headers = self._build_headers()
+
+    def _build_headers(self):
+        """Build the request headers carrying optional Sumo Logic metadata."""
+        headers = {"Content-Type": "text/plain"}
+
+        # Add optional Sumo Logic metadata headers
+        if self.category:
+            headers["X-Sumo-Category"] = self.category
+        if self.name:
+            headers["X-Sumo-Name"] = self.name
+        if self.host:
+            headers["X-Sumo-Host"] = self.host
+        if self.fields:
+            # Format fields as comma-separated key=value pairs
+            fields_str = ",".join([f"{k}={v}" for k, v in self.fields.items()])
+            headers["X-Sumo-Fields"] = fields_str
+
+        return headers
+
     def _obfuscate_endpoint(self, endpoint):
         """Obfuscate the middle portion of the Sumo Logic endpoint URL for logging."""
         try:
@@ -344,24 +788,11 @@ class SumoLogicSender:
             return endpoint
 
     def send_log(self, log_line):
-        """Send a single log line to Sumo Logic HTTP source."""
-        headers = {"Content-Type": "text/plain"}
-
-        # Add optional Sumo Logic metadata headers
-        if self.category:
-            headers["X-Sumo-Category"] = self.category
-        if self.name:
-            headers["X-Sumo-Name"] = self.name
-        if self.host:
-            headers["X-Sumo-Host"] = self.host
-        if self.fields:
-            # Format fields as comma-separated key=value pairs
-            fields_str = ",".join([f"{k}={v}" for k, v in self.fields.items()])
-            headers["X-Sumo-Fields"] = fields_str
-
+        """Send a single log line (``str`` or raw ``bytes``) to Sumo Logic HTTP source."""
+        data = log_line if isinstance(log_line, (bytes, bytearray)) else log_line.encode("utf-8")
         try:
             response = self.session.post(
-                self.endpoint, data=log_line.encode("utf-8"), headers=headers, timeout=10
+                self.endpoint, data=data, headers=self._headers, timeout=10
             )
 
             if response.status_code == 200:
@@ -374,6 +805,10 @@ class SumoLogicSender:
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Failed to send log to Sumo Logic: {e}")
 
+    def close(self):
+        """Release pooled HTTP connections."""
+        self.session.close()
+
     def process_flog_output(self, flog_cmd):
         """Execute flog and process its output."""
         self.logger.info(f"Executing: {' '.join(flog_cmd)}")
@@ -385,33 +820,42 @@ class SumoLogicSender:
                 flog_cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
             )
 
             line_count = 0
             success_count = 0
 
-            # Process each line of output
-            for line in iter(process.stdout.readline, ""):
-                if line.strip():  # Skip empty lines
-                    line_count += 1
-                    self.logger.debug(f"Processing line {line_count}: {line.strip()[:100]}...")
+            # Checked once so disabled per-line debug logging costs nothing
+            debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+
+            # stderr is collected while stdout is read so neither pipe can fill up
+            stderr_buffer = bytearray()
+
+            # Lines stay as the bytes flog wrote, so sending them needs no re-encode
+            for line in stream_flog_lines(
+                process.stdout, stderr=process.stderr, stderr_buffer=stderr_buffer, decode=False
+            ):
+                line_count += 1
+                if debug_enabled:
+                    self.logger.debug(
+                        "Processing line %d: %s...",
+                        line_count,
+                        line[:100].decode("utf-8", errors="replace"),
+                    )
 
-                    # Send raw log line to Sumo Logic
-                    self.send_log(line.strip())
-                    success_count += 1
+                # Send raw log line to Sumo Logic
+                self.send_log(line)
+                success_count += 1
 
-                    # Configurable delay to avoid overwhelming the endpoint
-                    if self.delay > 0:
-                        time.sleep(self.delay)
+                # Configurable delay to avoid overwhelming the endpoint
+                if self.delay > 0:
+                    time.sleep(self.delay)
 
             # Wait for process to complete
             process.wait()
 
             if process.returncode != 0:
-                stderr_output = process.stderr.read()
+                stderr_output = stderr_buffer.decode("utf-8", errors="replace")
                 self.logger.error(
                     f"flog process failed with return code {process.returncode}: {stderr_output}"
                 )
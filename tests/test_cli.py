@@ -0,0 +1,50 @@
+"""Tests for cli module."""
+
+from flog_otlp import cli
+
+
+class TestParseArgs:
+    """Tests for parse_args function."""
+
+    def test_parse_args_reuses_parser(self):
+        """Test the argument parser is built once and reused across calls."""
+        first = cli.parse_args(["-n", "10"])
+        parser = cli._PARSER
+        second = cli.parse_args(["-f", "json"])
+
+        assert cli._PARSER is parser
+        assert first.number == 10
+        assert first.format == "apache_common"
+        assert second.number == 200
+        assert second.format == "json"
+
+
+class TestConfigurationLines:
+    """Tests for _configuration_lines function."""
+
+    def test_configuration_lines_otlp(self):
+        """Test the OTLP configuration summary includes attributes and batching."""
+        from flog_otlp.sender import OTLPLogSender
+
+        args = cli.parse_args(["--otlp-attributes", "env=prod", "--batch-size", "50"])
+        sender = OTLPLogSender(otlp_attributes={"env": "prod"}, batch_size=50)
+
+        lines = cli._configuration_lines(args, sender)
+
+        assert lines[0] == "  Output Type: otlp"
+        assert "  OTLP Attributes: {'env': 'prod'}" in lines
+        assert "  Batch Size: 50" in lines
+        assert lines[-1] == "  Max Executions: 1"
+
+    def test_configuration_lines_sumologic_obfuscates_endpoint(self):
+        """Test the Sumo Logic summary obfuscates the endpoint token."""
+        from flog_otlp.sender import SumoLogicSender
+
+        endpoint = "https://collectors.sumologic.com/receiver/v1/http/ZaVnC4iD0FoV8dGHjklmM-LhA=="
+        args = cli.parse_args(["--output-type", "sumologic", "--sumo-endpoint", endpoint])
+        sender = SumoLogicSender(endpoint=endpoint)
+
+        lines = cli._configuration_lines(args, sender)
+
+        obfuscated = "https://collectors.sumologic.com/receiver/v1/http/ZaVnC***LhA=="
+        assert f"  Endpoint: {obfuscated}" in lines
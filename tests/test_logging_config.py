@@ -0,0 +1,93 @@
+"""Tests for logging_config module."""
+
+import io
+import logging
+import queue
+from unittest.mock import Mock
+
+from flog_otlp import logging_config
+from flog_otlp.logging_config import CoalescingMemoryHandler, setup_logging
+
+
+def _make_record(message, level=logging.INFO):
+    return logging.LogRecord("test", level, __file__, 1, message, None, None)
+
+
+class TestCoalescingMemoryHandler:
+    """Tests for CoalescingMemoryHandler class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.stream = io.StringIO()
+        self.target = logging.StreamHandler(self.stream)
+        self.target.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        self.log_queue = queue.SimpleQueue()
+        self.handler = CoalescingMemoryHandler(10, self.log_queue, target=self.target)
+
+    def test_buffers_while_queue_has_records(self):
+        """Test records are held back while more are waiting in the queue."""
+        self.log_queue.put("pending")
+        self.handler.handle(_make_record("first"))
+        assert self.stream.getvalue() == ""
+
+        self.log_queue.get()
+        self.handler.handle(_make_record("second"))
+        assert self.stream.getvalue() == "INFO first\nINFO second\n"
+
+    def test_flushes_on_error(self):
+        """Test ERROR records are written immediately."""
+        self.log_queue.put("pending")
+        self.handler.handle(_make_record("boom", logging.ERROR))
+        assert self.stream.getvalue() == "ERROR boom\n"
+
+    def test_flush_holds_target_lock(self):
+        """Test the coalesced write happens under the target handler's lock."""
+        calls = []
+        self.target.acquire = lambda: calls.append("acquire")
+        self.target.release = lambda: calls.append("release")
+        self.target.stream = Mock(write=lambda text: calls.append("write"))
+
+        self.handler.handle(_make_record("locked"))
+
+        assert calls == ["acquire", "write", "release"]
+
+
+class TestSetupLogging:
+    """Tests for setup_logging function."""
+
+    def setup_method(self):
+        """Remember the root logger state so each test can restore it."""
+        self.root = logging.getLogger()
+        self.original_handlers = list(self.root.handlers)
+        self.original_level = self.root.level
+        self.shutdowns = []
+
+    def teardown_method(self):
+        """Detach handlers added by setup_logging and stop its listener."""
+        for handler in list(self.root.handlers):
+            if handler not in self.original_handlers:
+                self.root.removeHandler(handler)
+        self.root.setLevel(self.original_level)
+        for shutdown in self.shutdowns:
+            shutdown()
+
+    def test_repeated_calls_configure_once(self, monkeypatch):
+        """Test calling setup_logging again doesn't attach a second queue handler."""
+        monkeypatch.setattr(logging_config.atexit, "register", self.shutdowns.append)
+
+        setup_logging()
+        setup_logging()
+
+        added = [h for h in self.root.handlers if h not in self.original_handlers]
+        assert len(added) == 1
+        assert len(self.shutdowns) == 1
+
+    def test_shutdown_writes_buffered_records(self, monkeypatch, capsys):
+        """Test the atexit hook drains the queue and writes out buffered records."""
+        monkeypatch.setattr(logging_config.atexit, "register", self.shutdowns.append)
+
+        setup_logging()
+        logging.getLogger("otlp_log_sender").info("written before exit")
+        self.shutdowns.pop()()
+
+        assert "written before exit" in capsys.readouterr().err
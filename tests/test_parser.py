@@ -49,3 +49,32 @@ def test_parse_key_value_pairs_malformed(caplog):
     expected = {"valid": "value"}
     assert result == expected
     assert "Ignoring malformed attribute 'malformed'" in caplog.text
+
+
+def test_parse_key_value_pairs_malformed_warns_on_cached_calls(caplog):
+    """Test the malformed-entry warning is repeated when the parse is served from cache."""
+    for _ in range(2):
+        assert parse_key_value_pairs(["again_malformed", "k=v"]) == {"k": "v"}
+    assert caplog.text.count("Ignoring malformed attribute 'again_malformed'") == 2
+
+
+def test_parse_key_value_pairs_negative_and_mixed_numbers():
+    """Test negative numbers and number-like strings are converted correctly."""
+    result = parse_key_value_pairs(["offset=-5", "ratio=-0.25", "double=--5", "version=1.2.3"])
+    expected = {"offset": -5, "ratio": -0.25, "double": "--5", "version": "1.2.3"}
+    assert result == expected
+
+
+def test_parse_key_value_pairs_returns_independent_dicts():
+    """Test repeated calls with the same input do not share a mutable result."""
+    first = parse_key_value_pairs(["env=prod"])
+    first["env"] = "changed"
+    second = parse_key_value_pairs(["env=prod"])
+    assert second == {"env": "prod"}
+
+
+def test_parse_key_value_pairs_mismatched_quotes():
+    """Test quotes are only stripped when both ends match."""
+    result = parse_key_value_pairs(["name=\"mixed'", "'key\"=value", 'empty=""'])
+    expected = {"name": "\"mixed'", "'key\"": "value", "empty": ""}
+    assert result == expected
@@ -6,7 +6,13 @@ from unittest.mock import Mock
 import pytest
 import yaml
 
-from flog_otlp.scenario import ScenarioExecutor, ScenarioParser, ScenarioStep
+from flog_otlp.scenario import (
+    ScenarioExecutor,
+    ScenarioParser,
+    ScenarioStep,
+    _compile_cached,
+    _compile_template,
+)
 
 
 class TestScenarioStep:
@@ -50,6 +56,13 @@ class TestScenarioStep:
         with pytest.raises(ValueError, match="Invalid duration format"):
             ScenarioStep({"start_time": "10x", "interval": "10s"})
 
+    def test_parse_duration_rejects_float_syntax(self):
+        """Test only plain decimal numbers are accepted as durations."""
+        for value in ["inf", "1e3", "-5s", ".5m", "5.", "1_000"]:
+            with pytest.raises(ValueError, match="Invalid duration format"):
+                ScenarioStep._parse_duration(value)
+        assert ScenarioStep._parse_duration(" 5 M ") == 300.0
+
     def test_default_values(self):
         """Test default values for step parameters."""
         step = ScenarioStep({})
@@ -119,6 +132,50 @@ class TestScenarioStep:
         assert step.matches_filters("error occurred") is True
         assert step.matches_filters("ERROR occurred") is True
 
+    def test_matches_filters_combined_into_union(self):
+        """Test multiple filters are searched through one combined pattern."""
+        step = ScenarioStep({"filters": [r"ERROR", r"status (5\d\d)"]})
+        assert step._union_filter is not None
+        assert step.matches_filters("status 503") is True
+        assert step.matches_filters("status 200") is False
+
+    def test_matches_filters_plain_text_uses_substrings(self):
+        """Test filters without regex syntax are matched as plain substrings."""
+        step = ScenarioStep({"filters": ["ERROR", "GET /api", "status=500"]})
+        assert step._literal_filters == ("ERROR", "GET /api", "status=500")
+        assert step.matches_filters("GET /api/users 200") is True
+        assert step.matches_filters("upstream status=500") is True
+        assert step.matches_filters("GET /health 200") is False
+
+        # A single regex filter disables the substring path for the whole step
+        step = ScenarioStep({"filters": ["ERROR", r"status=5\d\d"]})
+        assert step._literal_filters is None
+        assert step.matches_filters("status=503") is True
+
+    def test_matches_filters_union_fallbacks(self):
+        """Test filters that can't be combined still match individually."""
+        # Inline global flags are only valid at the start of a pattern
+        step = ScenarioStep({"filters": [r"(?i)error", r"timeout"]})
+        assert step._union_filter is None
+        assert step.matches_filters("Error occurred") is True
+        assert step.matches_filters("request timeout") is True
+        assert step.matches_filters("all good") is False
+
+        # Backreferences would be renumbered inside a union
+        step = ScenarioStep({"filters": [r"(GET|POST)", r"(\w+)=\1"]})
+        assert step._union_filter is None
+        assert step.matches_filters("x=x") is True
+        assert step.matches_filters("x=y") is False
+
+    def test_patterns_compiled_once_across_steps(self):
+        """Test steps reusing a pattern share one compiled regex."""
+        _compile_cached.cache_clear()
+        first = ScenarioStep({"filters": [r"ERROR \d+"]})
+        second = ScenarioStep({"filters": [r"ERROR \d+"]})
+
+        assert first.compiled_filters[0] is second.compiled_filters[0]
+        assert _compile_cached.cache_info().misses == 1
+
     def test_replacements_stored_and_compiled(self):
         """Test that replacements are stored and compiled correctly."""
         replacements = [
@@ -161,6 +218,25 @@ class TestScenarioStep:
         expected = "Login: user_anonymous password=*** successful"
         assert result == expected
 
+    def test_apply_replacements_static_template_is_literal(self):
+        """Test static templates skip formatting and are inserted literally."""
+        step = ScenarioStep(
+            {"replacements": [{"pattern": r"path=\S+", "replacement": r"path=C:\tmp"}]}
+        )
+        assert step.compiled_replacements[0][2] is False
+        assert step.apply_replacements("open path=/var/log ok") == r"open path=C:\tmp ok"
+
+        # Group references in a static template are not expanded by sub()
+        step = ScenarioStep(
+            {"replacements": [{"pattern": r"(id)=\d+", "replacement": r"\1=\g<0>"}]}
+        )
+        assert step.apply_replacements("id=42") == r"\1=\g<0>"
+
+    def test_format_replacement_variables_no_sigil(self):
+        """Test templates without a % sigil are returned unchanged."""
+        step = ScenarioStep({})
+        assert step._format_replacement_variables("plain text") == "plain text"
+
     def test_format_replacement_variables_sentence(self):
         """Test %s formatting variable for lorem sentence."""
         step = ScenarioStep({})
@@ -170,6 +246,18 @@ class TestScenarioStep:
         # Should contain some lorem text
         assert any(char.isalpha() for char in result[9:])  # Skip "Message: " prefix
 
+    def test_sentence_variable_samples_step_pool(self):
+        """Test %s draws from the sentences pre-generated for the step."""
+        step = ScenarioStep(
+            {
+                "sentence_pool_size": 3,
+                "replacements": [{"pattern": r"msg=.*", "replacement": "msg=%s"}],
+            }
+        )
+        assert len(step._sentence_pool) == 3
+        for _ in range(10):
+            assert step.apply_replacements("msg=x")[4:] in step._sentence_pool
+
     def test_format_replacement_variables_random_number(self):
         """Test %n[x,y] formatting variable for random integers."""
         step = ScenarioStep({})
@@ -198,6 +286,37 @@ class TestScenarioStep:
         epoch_time = int(epoch_str)
         assert before_time <= epoch_time <= after_time
 
+    def test_apply_replacements_uses_iteration_epoch(self):
+        """Test a supplied epoch snapshot is used for every %e in the line."""
+        step = ScenarioStep({"replacements": [{"pattern": r"ts=\d+", "replacement": "ts=%e"}]})
+        result = step.apply_replacements("a ts=1 b ts=2", epoch="1700000000")
+        assert result == "a ts=1700000000 b ts=1700000000"
+
+    def test_apply_replacements_formats_only_on_match(self):
+        """Test templates are formatted lazily, once per matching line."""
+        step = ScenarioStep(
+            {"replacements": [{"pattern": r"user_\d+", "replacement": "user_%n[1,9]"}]}
+        )
+        step._format_replacement_variables = Mock(return_value="user_7")
+
+        assert step.apply_replacements("no users here") == "no users here"
+        step._format_replacement_variables.assert_not_called()
+
+        assert step.apply_replacements("user_1 and user_2") == "user_7 and user_7"
+        step._format_replacement_variables.assert_called_once()
+
+    def test_seeded_steps_generate_identical_values(self):
+        """Test a step seed makes its random replacement values reproducible."""
+        template = "%n[1,1000000] %x[8] %r[6] %g %s"
+        first = ScenarioStep({"seed": 42})._format_replacement_variables(template)
+        second = ScenarioStep({"seed": 42})._format_replacement_variables(template)
+        assert first == second
+
+        step_data = {"seed": 7, "replacements": [{"pattern": "msg", "replacement": "%s"}]}
+        first = [ScenarioStep(step_data).apply_replacements("msg") for _ in range(2)]
+        second = [ScenarioStep(step_data).apply_replacements("msg") for _ in range(2)]
+        assert first == second
+
     def test_format_replacement_variables_hex_lowercase(self):
         """Test %x[n] formatting variable for lowercase hexadecimal."""
         step = ScenarioStep({})
@@ -293,6 +412,39 @@ class TestScenarioStep:
         for guid in guids:
             assert re.match(guid_pattern, guid)
 
+    def test_format_replacement_variables_repeated_tokens(self):
+        """Test each occurrence of a variable is expanded independently in place."""
+        step = ScenarioStep({})
+        result = step._format_replacement_variables("a=%x[6] b=%x[6] c=%g d=%g")
+
+        parts = dict(part.split("=") for part in result.split(" "))
+        assert len(parts["a"]) == 6 and len(parts["b"]) == 6
+        assert parts["c"] != parts["d"]
+
+    def test_format_replacement_variables_generated_text_not_rescanned(self):
+        """Test generated values are never re-expanded or matched by later tokens."""
+        step = ScenarioStep({}, {"tokens": ["%x[2]"], "ids": ["%n[1,1]"]})
+        result = step._format_replacement_variables("%S[tokens] %S[ids] %n[7,7] %n[7,7]")
+        assert result == "%x[2] %n[1,1] 7 7"
+
+    def test_compile_template_preparses_variables(self):
+        """Test templates are split once into literals and pre-parsed variables."""
+        assert _compile_template("id=%x[8] n=%n[1,5] %S[names]!") == (
+            "id=",
+            ("x", 8),
+            " n=",
+            ("n", 1, 5),
+            " ",
+            ("S", "names"),
+            "!",
+        )
+        assert _compile_template("%g%e") == (("g",), ("e",))
+
+    def test_format_replacement_variables_unknown_token_untouched(self):
+        """Test malformed or unknown % tokens are left as literal text."""
+        step = ScenarioStep({})
+        assert step._format_replacement_variables("100% done %q %n[5]") == "100% done %q %n[5]"
+
     def test_format_replacement_variables_custom_strings(self):
         """Test %S[key] formatting variable for custom strings."""
         custom_strings = {
@@ -552,6 +704,12 @@ class TestScenarioParser:
         cmd = parser.build_flog_command_from_parameters({})
         assert cmd == ["flog"]
 
+    def test_step_flog_command_built_once(self):
+        """Test steps carry the flog command built from their parameters."""
+        params = {"format": "json", "number": 5, "no_loop": True}
+        step = ScenarioStep({"parameters": params})
+        assert step.flog_cmd == ScenarioParser().build_flog_command_from_parameters(params)
+
     def test_get_total_scenario_duration(self):
         """Test calculating total scenario duration."""
         steps = [
@@ -567,6 +725,22 @@ class TestScenarioParser:
         # Step 3: last iteration at 60+2*30=120, ends at 120+30=150
         assert total_duration == 150.0
 
+    def test_get_max_concurrent_steps(self):
+        """Test the overlap estimate counts only steps whose run windows coincide."""
+        parser = ScenarioParser()
+        sequential = [
+            ScenarioStep({"start_time": f"{i * 60}s", "interval": "30s", "iterations": 1})
+            for i in range(40)
+        ]
+        assert parser.get_max_concurrent_steps(sequential) == 1
+
+        steps = [
+            ScenarioStep({"start_time": "0s", "interval": "30s", "iterations": 4}),
+            ScenarioStep({"start_time": "30s", "interval": "60s", "iterations": 1}),
+            ScenarioStep({"start_time": "200s", "interval": "10s", "iterations": 1}),
+        ]
+        assert parser.get_max_concurrent_steps(steps) == 2
+
     def test_get_total_scenario_duration_empty(self):
         """Test calculating duration for empty steps."""
         parser = ScenarioParser()
@@ -582,3 +756,202 @@ class TestScenarioExecutor:
         executor = ScenarioExecutor(mock_sender)
         assert executor.otlp_sender == mock_sender
         assert executor.logger is not None
+
+    def test_create_step_sender_applies_overrides(self):
+        """Test step parameters are reflected in the step sender's OTLP resource."""
+        from flog_otlp.sender import OTLPLogSender
+
+        base_sender = OTLPLogSender(otlp_attributes={"env": "prod"})
+        executor = ScenarioExecutor(base_sender)
+
+        step_sender = executor._create_step_sender(
+            {
+                "service_name": "step-service",
+                "delay": "0",
+                "otlp_attributes": ["region=us-east-1"],
+                "telemetry_attributes": ["phase=one"],
+            }
+        )
+
+        assert step_sender.delay == 0.0
+        assert step_sender.otlp_attributes == {"env": "prod", "region": "us-east-1"}
+        assert base_sender.otlp_attributes == {"env": "prod"}
+
+        payload = step_sender.create_otlp_payload(
+            {"message": "msg", "level": "INFO", "timestamp": "2023-01-01T12:00:00Z"}
+        )
+        resource_logs = payload["resourceLogs"][0]
+        resource = {a["key"]: a["value"] for a in resource_logs["resource"]["attributes"]}
+        assert resource["service.name"] == {"stringValue": "step-service"}
+        assert resource["region"] == {"stringValue": "us-east-1"}
+
+        log_record = resource_logs["scopeLogs"][0]["logRecords"][0]
+        attributes = {a["key"]: a["value"] for a in log_record["attributes"]}
+        assert attributes["phase"] == {"stringValue": "one"}
+
+    def test_execute_scenario_runs_steps_on_bounded_pool(self):
+        """Test every step iteration runs while using at most max_workers threads."""
+        import threading
+
+        executor = ScenarioExecutor(Mock(), max_workers=1)
+        calls = []
+        threads = set()
+
+        def fake_iteration(step_number, iteration, step, step_sender):
+            calls.append((step_number, iteration))
+            threads.add(threading.current_thread().name)
+
+        executor._execute_step_iteration = fake_iteration
+        executor._create_step_sender = Mock()
+        steps = [
+            ScenarioStep({"start_time": "0s", "interval": "0s", "iterations": 2}),
+            ScenarioStep({"start_time": "0.05s", "interval": "0s", "iterations": 1}),
+        ]
+
+        scenario = {"name": "pool", "description": "", "steps": steps}
+        assert executor.execute_scenario(scenario, ScenarioParser()) is True
+        assert sorted(calls) == [(1, 1), (1, 2), (2, 1)]
+        assert len(threads) == 1
+
+    def test_execute_scenario_dispatches_unsorted_steps_by_start_time(self):
+        """Test a late step listed first doesn't delay earlier-starting steps."""
+        import time
+
+        executor = ScenarioExecutor(Mock())
+        started = {}
+        scenario_start = time.monotonic()
+
+        def fake_iteration(step_number, iteration, step, step_sender):
+            started[step_number] = time.monotonic() - scenario_start
+
+        executor._execute_step_iteration = fake_iteration
+        executor._create_step_sender = Mock()
+        steps = [
+            ScenarioStep({"start_time": "0.2s", "interval": "0s"}),
+            ScenarioStep({"start_time": "0s", "interval": "0s"}),
+        ]
+
+        scenario = {"name": "unsorted", "description": "", "steps": steps}
+        assert executor.execute_scenario(scenario, ScenarioParser()) is True
+        assert started[2] < 0.1
+        assert started[1] >= 0.2
+
+    def test_execute_scenario_error_stops_running_steps(self):
+        """Test an unexpected dispatch error signals already-running steps to stop."""
+        executor = ScenarioExecutor(Mock())
+        stopped = []
+
+        def fake_run_step(step_number, step):
+            stopped.append(executor.stop_event.wait(5))
+
+        executor._run_step = fake_run_step
+        original_schedule = executor._schedule_step
+
+        def failing_schedule(pool, step_number, step):
+            if step_number == 2:
+                raise RuntimeError("dispatch failed")
+            original_schedule(pool, step_number, step)
+
+        executor._schedule_step = failing_schedule
+        steps = [ScenarioStep({"interval": "0s"}), ScenarioStep({"interval": "0s"})]
+
+        scenario = {"name": "error", "description": "", "steps": steps}
+        assert executor.execute_scenario(scenario, ScenarioParser()) is False
+        executor.step_futures[0].result(timeout=5)
+        assert stopped == [True]
+
+    def test_execute_scenario_logs_steps_actually_started(self, caplog):
+        """Test an early stop reports how many steps were started, not the total."""
+        executor = ScenarioExecutor(Mock(), max_workers=1)
+        executor._execute_step_iteration = Mock()
+        executor._create_step_sender = Mock()
+        executor.stop_event.set()
+        steps = [
+            ScenarioStep({"interval": "0s"}),
+            ScenarioStep({"start_time": "5s", "interval": "0s"}),
+        ]
+
+        scenario = {"name": "early stop", "description": "", "steps": steps}
+        with caplog.at_level("INFO"):
+            executor.execute_scenario(scenario, ScenarioParser())
+
+        assert "Stopped after starting 1 of 2 steps" in caplog.text
+        assert "All 2 steps started" not in caplog.text
+
+    def test_execute_scenario_warns_only_on_real_overlap(self, caplog):
+        """Test the concurrency warning depends on overlapping steps, not the step count."""
+        for start_times, expect_warning in [(["0s", "60s"], False), (["0s", "10s"], True)]:
+            executor = ScenarioExecutor(Mock(), max_workers=1)
+            executor._execute_step_iteration = Mock()
+            executor._create_step_sender = Mock()
+            executor.stop_event.set()
+            steps = [ScenarioStep({"start_time": t, "interval": "30s"}) for t in start_times]
+
+            caplog.clear()
+            scenario = {"name": "overlap", "description": "", "steps": steps}
+            with caplog.at_level("WARNING"):
+                executor.execute_scenario(scenario, ScenarioParser())
+
+            warned = "Up to 2 steps overlap but at most 1 run concurrently" in caplog.text
+            assert warned is expect_warning
+
+    def test_run_step_uses_fixed_deadlines(self):
+        """Test iteration run time is absorbed by the interval instead of adding drift."""
+        import time
+
+        executor = ScenarioExecutor(Mock())
+        starts = []
+
+        def slow_iteration(step_number, iteration, step, step_sender):
+            starts.append(time.monotonic())
+            time.sleep(0.05)
+
+        executor._execute_step_iteration = slow_iteration
+        executor._create_step_sender = Mock()
+        step = ScenarioStep({"interval": "0.1s", "iterations": 3})
+        executor._run_step(1, step)
+
+        assert len(starts) == 3
+        # Sleeping after each run would put the last start at ~0.3s
+        assert starts[2] - starts[0] < 0.27
+
+    def test_run_step_shares_one_sender(self):
+        """Test a step builds one sender for all its iterations and closes it once."""
+        executor = ScenarioExecutor(Mock())
+        senders = []
+
+        executor._execute_step_iteration = lambda n, i, step, sender: senders.append(sender)
+        executor._create_step_sender = Mock()
+        step = ScenarioStep({"interval": "0s", "iterations": 3, "parameters": {"rate": 5}})
+        executor._run_step(1, step)
+
+        executor._create_step_sender.assert_called_once_with({"rate": 5})
+        step_sender = executor._create_step_sender.return_value
+        assert senders == [step_sender] * 3
+        step_sender.close.assert_called_once()
+
+    def test_forward_lines_batches_filtered_lines(self):
+        """Test matching lines are rewritten and queued into one batched request."""
+        from flog_otlp.sender import OTLPLogSender
+
+        sender = OTLPLogSender(batch_size=10)
+        sender.send_log = Mock()
+        executor = ScenarioExecutor(sender)
+        step = ScenarioStep(
+            {
+                "filters": [r"ERROR|WARN"],
+                "replacements": [{"pattern": r"at \d+", "replacement": "at %e"}],
+            }
+        )
+
+        lines = ["ERROR disk at 1", "INFO ok", "WARN slow at 2"]
+        counts = executor._forward_lines(sender, iter(lines), step, epoch="42")
+        assert counts == (3, 2, 1)
+
+        # Both lines wait in the pending batch and go out as one request
+        sender.send_log.assert_not_called()
+        sender.flush()
+        sender.send_log.assert_called_once()
+        records = sender.send_log.call_args[0][0]["resourceLogs"][0]["scopeLogs"][0]["logRecords"]
+        bodies = [r["body"]["stringValue"] for r in records]
+        assert bodies == ["ERROR disk at 42", "WARN slow at 42"]
@@ -1,8 +1,85 @@
 """Tests for sender module."""
 
+import json
+import os
+import time
 from unittest.mock import Mock, patch
 
-from flog_otlp.sender import OTLPLogSender
+import pytest
+
+from flog_otlp.sender import (
+    OTLPLogSender,
+    RateLimiter,
+    iter_flog_lines,
+    parse_utc_timestamp_ns,
+    stream_flog_lines,
+)
+
+
+def test_iter_flog_lines_splits_chunks():
+    """Test lines are reassembled across read boundaries and blanks skipped."""
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b"first line\n\nsecond line\r\nunterminated")
+    os.close(write_fd)
+
+    with os.fdopen(read_fd, "rb") as stream:
+        lines = list(iter_flog_lines(stream, chunk_size=4))
+
+    assert lines == ["first line", "second line", "unterminated"]
+
+
+def test_stream_flog_lines_background_reader():
+    """Test the background reader delivers every line through the bounded queue."""
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b"".join(f"line {i}\n".encode() for i in range(100)))
+    os.close(write_fd)
+
+    with os.fdopen(read_fd, "rb") as stream:
+        lines = list(stream_flog_lines(stream, chunk_size=16, maxsize=2))
+
+    assert lines == [f"line {i}" for i in range(100)]
+
+
+def test_stream_flog_lines_collects_stderr():
+    """Test stderr is drained alongside stdout into the supplied buffer."""
+    out_read, out_write = os.pipe()
+    err_read, err_write = os.pipe()
+    os.write(out_write, b"log line\n")
+    os.write(err_write, b"flog warning")
+    os.close(out_write)
+    os.close(err_write)
+
+    stderr_buffer = bytearray()
+    with os.fdopen(out_read, "rb") as stdout, os.fdopen(err_read, "rb") as stderr:
+        lines = list(stream_flog_lines(stdout, stderr=stderr, stderr_buffer=stderr_buffer))
+
+    assert lines == ["log line"]
+    assert stderr_buffer == b"flog warning"
+
+
+def test_stream_flog_lines_raw_bytes():
+    """Test lines can be delivered as stripped bytes without decoding."""
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b"first\r\n\n  second  \nlast")
+    os.close(write_fd)
+
+    with os.fdopen(read_fd, "rb") as stream:
+        lines = list(stream_flog_lines(stream, chunk_size=4, decode=False))
+
+    assert lines == [b"first", b"second", b"last"]
+    assert all(type(line) is bytes for line in lines)
+
+
+def test_rate_limiter_spaces_acquisitions():
+    """Test the token bucket allows a burst then spaces further acquisitions."""
+    limiter = RateLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+    elapsed = time.monotonic() - start
+
+    # First token is free, the remaining three wait ~20ms each
+    assert 0.05 <= elapsed < 0.2
 
 
 class TestOTLPLogSender:
@@ -53,7 +130,8 @@ class TestOTLPLogSender:
 
         assert result["message"] == "test message"
         assert result["level"] == "ERROR"
-        assert result["timestamp"] == "2023-01-01T12:00:00Z"
+        # Converted to nanoseconds once, at parse time
+        assert result["timestamp"] == 1_672_574_400_000_000_000
 
     def test_parse_flog_line_plain_text(self):
         """Test parsing plain text flog line."""
@@ -64,6 +142,76 @@ class TestOTLPLogSender:
         assert result["level"] == "INFO"
         assert "timestamp" in result
 
+    def test_parse_flog_line_non_object_json_is_plain_text(self):
+        """Test lines that are not JSON objects are kept as plain text."""
+        for line in ["404", '"quoted"', "{not json"]:
+            result = self.sender.parse_flog_line(line)
+            assert result["message"] == line
+            assert result["level"] == "INFO"
+
+    def test_parse_flog_line_non_string_message(self):
+        """Test non-string JSON messages are coerced to text and can be queued."""
+        self.sender.send_log = Mock()
+        for line, expected in [('{"message": 5}', "5"), ('{"message": null}', "None")]:
+            result = self.sender.parse_flog_line(line)
+            assert result["message"] == expected
+            self.sender.queue_log(result)
+
+        self.sender.flush()
+        bodies = [
+            record["body"]["stringValue"]
+            for call in self.sender.send_log.call_args_list
+            for record in call[0][0]["resourceLogs"][0]["scopeLogs"][0]["logRecords"]
+        ]
+        assert bodies == ["5", "None"]
+
+    def test_plain_text_timestamp_skips_iso_round_trip(self):
+        """Test receive-time timestamps are kept as integer nanoseconds."""
+        with patch("flog_otlp.sender.time.time_ns", return_value=1_700_000_000_123_456_789):
+            result = self.sender.parse_flog_line("plain text line")
+
+        assert result["timestamp"] == 1_700_000_000_123_456_789
+        payload = self.sender.create_otlp_payload(result)
+        log_record = payload["resourceLogs"][0]["scopeLogs"][0]["logRecords"][0]
+        assert log_record["timeUnixNano"] == "1700000000123456789"
+
+    def test_utc_timestamp_fast_path_matches_fromisoformat(self):
+        """Test sliced "...Z" timestamps agree with the fromisoformat result."""
+        assert parse_utc_timestamp_ns("2023-01-01T12:00:00Z") == 1_672_574_400_000_000_000
+        assert parse_utc_timestamp_ns("2024-02-29T23:59:59.123Z") == 1_709_251_199_123_000_000
+        assert parse_utc_timestamp_ns("2023-01-01T12:00:00.123456789Z") == (
+            1_672_574_400_123_456_789
+        )
+        assert self.sender._timestamp_to_ns("2023-01-01T12:00:00Z") == 1_672_574_400_000_000_000
+
+    def test_utc_timestamp_parse_is_cached(self):
+        """Test repeated timestamps are served from the conversion cache."""
+        parse_utc_timestamp_ns.cache_clear()
+        for _ in range(3):
+            self.sender.parse_flog_line('{"message": "m", "time": "2023-01-01T12:00:00Z"}')
+
+        info = parse_utc_timestamp_ns.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
+
+    def test_utc_timestamp_fast_path_rejects_other_shapes(self):
+        """Test anything but a well-formed UTC "Z" timestamp is left to the slow path."""
+        for timestamp in [
+            "2023-01-01T12:00:00+00:00",
+            "2023-02-30T12:00:00Z",
+            "2023-13-01T12:00:00Z",
+            "2023-01-01 12:00:00Z",
+            "2023-01-01T12:00:00.Z",
+            "2023-01-01T12:0a:00Z",
+            "2024-01-01T00:00:00Z1Z",
+        ]:
+            assert parse_utc_timestamp_ns(timestamp) is None
+
+        # Offsets still go through fromisoformat
+        assert self.sender._timestamp_to_ns("2023-01-01T13:00:00+01:00") == (
+            1_672_574_400_000_000_000
+        )
+
     def test_convert_attribute_value_string(self):
         """Test attribute value conversion for strings."""
         result = self.sender._convert_attribute_value("test")
@@ -92,6 +240,30 @@ class TestOTLPLogSender:
         assert self.sender.get_severity_number("ERROR") == 17
         assert self.sender.get_severity_number("UNKNOWN") == 9  # Default
 
+    def test_severity_resolved_once_per_record(self):
+        """Test the severity number is looked up once and reused for the record."""
+        self.sender.send_log = Mock()
+        self.sender.get_severity_number = Mock(return_value=17)
+
+        self.sender.queue_log({"message": "boom", "level": "ERROR", "timestamp": 0})
+
+        self.sender.get_severity_number.assert_called_once_with("ERROR")
+        payload = self.sender.send_log.call_args[0][0]
+        log_record = payload["resourceLogs"][0]["scopeLogs"][0]["logRecords"][0]
+        assert log_record["severityNumber"] == 17
+
+    def test_parse_flog_line_carries_severity_number(self):
+        """Test parsed entries already include their severity number."""
+        json_line = '{"message": "m", "level": "warn", "time": "2023-01-01T12:00:00Z"}'
+        assert self.sender.parse_flog_line(json_line)["severity_number"] == 13
+        assert self.sender.parse_flog_line("plain line")["severity_number"] == 9
+
+    def test_get_severity_number_any_case(self):
+        """Test lowercase and mixed-case levels map like their uppercase form."""
+        assert self.sender.get_severity_number("error") == 17
+        assert self.sender.get_severity_number("Warn") == 13
+        assert self.sender.get_severity_number("fatal") == 21
+
     def test_create_otlp_payload(self):
         """Test OTLP payload creation."""
         log_entry = {
@@ -148,4 +320,132 @@ class TestOTLPLogSender:
         mock_session.post.assert_called_once()
         args, kwargs = mock_session.post.call_args
         assert args[0] == sender.endpoint
-        assert kwargs["json"] == payload
+        assert json.loads(kwargs["data"]) == payload
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+
+    def test_create_otlp_batch_payload(self):
+        """Test batch payload carries one log record per entry."""
+        log_entries = [
+            {"message": f"message {i}", "level": "INFO", "timestamp": "2023-01-01T12:00:00Z"}
+            for i in range(3)
+        ]
+
+        payload = self.sender.create_otlp_batch_payload(log_entries)
+        log_records = payload["resourceLogs"][0]["scopeLogs"][0]["logRecords"]
+
+        assert len(log_records) == 3
+        assert [r["body"]["stringValue"] for r in log_records] == [
+            "message 0",
+            "message 1",
+            "message 2",
+        ]
+
+    def test_queue_log_flushes_on_batch_size(self):
+        """Test queued entries are sent once the batch size is reached."""
+        sender = OTLPLogSender(batch_size=2)
+        sender.send_log = Mock()
+        log_entry = {"message": "msg", "level": "INFO", "timestamp": "2023-01-01T12:00:00Z"}
+
+        assert sender.queue_log(log_entry) is False
+        sender.send_log.assert_not_called()
+
+        assert sender.queue_log(log_entry) is True
+        sender.send_log.assert_called_once()
+        payload = sender.send_log.call_args[0][0]
+        assert len(payload["resourceLogs"][0]["scopeLogs"][0]["logRecords"]) == 2
+
+    def test_queue_log_flushes_error_immediately(self):
+        """Test ERROR records flush the pending batch without waiting."""
+        sender = OTLPLogSender(batch_size=100)
+        sender.send_log = Mock()
+
+        sender.queue_log({"message": "ok", "level": "INFO", "timestamp": "2023-01-01T12:00:00Z"})
+        sender.queue_log({"message": "bad", "level": "ERROR", "timestamp": "2023-01-01T12:00:00Z"})
+
+        sender.send_log.assert_called_once()
+        payload = sender.send_log.call_args[0][0]
+        assert len(payload["resourceLogs"][0]["scopeLogs"][0]["logRecords"]) == 2
+
+    def test_flush_empty_batch(self):
+        """Test flushing with nothing pending does not send."""
+        sender = OTLPLogSender(batch_size=10)
+        sender.send_log = Mock()
+        sender.flush()
+        sender.send_log.assert_not_called()
+
+    def test_send_workers_post_batches_in_background(self):
+        """Test batches are handed to the send pool and drained on close."""
+        import threading
+
+        sender = OTLPLogSender(batch_size=1, send_workers=2)
+        sender.session = Mock()
+        threads = []
+        sender.send_log = Mock(side_effect=lambda p: threads.append(threading.current_thread()))
+
+        for i in range(5):
+            sender.queue_log({"message": f"m{i}", "level": "INFO", "timestamp": 0})
+        sender.close()
+
+        assert sender.send_log.call_count == 5
+        assert threading.current_thread() not in threads
+        sender.session.close.assert_called_once()
+
+    def test_send_log_gzip_compression(self):
+        """Test large payloads are gzip-compressed with a Content-Encoding header."""
+        import gzip
+
+        sender = OTLPLogSender(compression="gzip")
+        sender.session = Mock()
+        sender.session.post.return_value = Mock(status_code=200)
+        payload = sender.create_otlp_payload(
+            {"message": "x" * 2048, "level": "INFO", "timestamp": "2023-01-01T12:00:00Z"}
+        )
+
+        sender.send_log(payload)
+
+        kwargs = sender.session.post.call_args[1]
+        assert kwargs["headers"]["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(kwargs["data"])) == payload
+
+    def test_send_log_compression_skips_small_payloads(self):
+        """Test payloads under the size threshold are sent uncompressed."""
+        sender = OTLPLogSender(compression="gzip")
+        sender.session = Mock()
+        sender.session.post.return_value = Mock(status_code=200)
+
+        sender.send_log({"test": "payload"})
+
+        kwargs = sender.session.post.call_args[1]
+        assert "Content-Encoding" not in kwargs["headers"]
+        assert json.loads(kwargs["data"]) == {"test": "payload"}
+
+    def test_invalid_compression(self):
+        """Test unknown compression types are rejected."""
+        with pytest.raises(ValueError, match="Unsupported compression"):
+            OTLPLogSender(compression="brotli")
+
+    def test_send_log_custom_headers(self):
+        """Test custom OTLP headers are merged with the default request headers."""
+        sender = OTLPLogSender(otlp_headers={"Authorization": "Bearer token"})
+        sender.session = Mock()
+        sender.session.post.return_value = Mock(status_code=200)
+
+        sender.send_log({"test": "payload"})
+
+        headers = sender.session.post.call_args[1]["headers"]
+        assert headers["Authorization"] == "Bearer token"
+        assert headers["Content-Type"] == "application/json"
+        assert headers["User-Agent"] == "otlp-log-sender/1.0"
+
+    def test_send_log_integer_beyond_64_bits(self):
+        """Test attribute integers too large for orjson still serialize."""
+        sender = OTLPLogSender(otlp_attributes={"id": 99999999999999999999})
+        sender.session = Mock()
+        sender.session.post.return_value = Mock(status_code=200)
+
+        sender.queue_log({"message": "msg", "level": "INFO", "timestamp": 0})
+        sender.flush()
+
+        data = json.loads(sender.session.post.call_args[1]["data"])
+        attributes = data["resourceLogs"][0]["resource"]["attributes"]
+        assert {"key": "id", "value": {"intValue": 99999999999999999999}} in attributes
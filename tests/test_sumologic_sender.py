@@ -66,6 +66,19 @@ class TestSumoLogicSender:
         assert headers["Content-Type"] == "text/plain"
         assert "X-Sumo-Category" not in headers  # No category was set
 
+    @patch("flog_otlp.sender.requests.Session")
+    def test_send_log_raw_bytes(self, mock_session_class):
+        """Test raw byte lines from flog are posted without re-encoding."""
+        mock_session = Mock()
+        mock_session.post.return_value = Mock(status_code=200)
+        mock_session_class.return_value = mock_session
+
+        sender = SumoLogicSender(endpoint="https://endpoint.sumologic.com/receiver/v1/http/...")
+        line = "caf\u00e9 log line".encode("utf-8")
+        sender.send_log(line)
+
+        assert mock_session.post.call_args[1]["data"] is line
+
     @patch("flog_otlp.sender.requests.Session")
     def test_send_log_with_metadata_headers(self, mock_session_class):
         """Test log sending with Sumo Logic metadata headers."""